@@ -1,3 +1,4 @@
+import importlib
 import os
 import sys
 
@@ -7,4 +8,36 @@ if not sys.platform.startswith("linux"):
         os.path.abspath(os.path.dirname(__file__)), "lib"
     )
 
-from .generic import *
+__all__ = [
+    "DCAMAPI",
+    "FrameClient",
+    "HamamatsuCamera",
+    "ReplayCamera",
+    "ThreadPlacement",
+    "TriggeredRecorder",
+]
+
+# public name -> defining submodule, resolved on first access so that importing the
+# package does not drag in NumPy, the Cython extension or any worker threads
+_lazy_imports = {
+    "DCAMAPI": "generic",
+    "FrameClient": "streaming",
+    "HamamatsuCamera": "generic",
+    "ReplayCamera": "replay",
+    "ThreadPlacement": "threads",
+    "TriggeredRecorder": "trigger",
+}
+
+
+def __getattr__(name):
+    try:
+        module = _lazy_imports[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_lazy_imports.keys()))
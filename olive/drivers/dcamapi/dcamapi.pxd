@@ -455,10 +455,19 @@ cdef extern from 'lib/dcamapi4.h':
         int32				reserved2				# [in] 0 reserved
 
     struct DCAMDATA_REGION:
-        pass
+        DCAMDATA_HDR		hdr						# [in] size:		size of this structure
+                                                    # [in] iKind:		DCAMDATA_KIND__REGION
+        int32				option					# [in] 0 reserved
+        int32				type					# [in] DCAMDATA_REGIONTYPE__*
+        void*				data					# [in ptr] DCAMDATA_REGIONRECT array or byte mask
+        int32				datasize				# [in] byte size of data
+        int32				reserved				# [in] 0 reserved
 
     struct DCAMDATA_REGIONRECT:
-        pass
+        short				left
+        short				top
+        short				right
+        short				bottom
 
     struct DCAMDATA_LUT:
         pass
@@ -597,7 +606,7 @@ cdef extern from 'lib/dcamapi4.h':
     DCAMERR dcamcap_start			( HDCAM h, int32 mode )
     DCAMERR dcamcap_stop			( HDCAM h )
     DCAMERR dcamcap_status			( HDCAM h, int32* pStatus )
-    DCAMERR dcamcap_transferinfo	( HDCAM h, DCAMCAP_TRANSFERINFO* param )
+    DCAMERR dcamcap_transferinfo	( HDCAM h, DCAMCAP_TRANSFERINFO* param ) nogil
     DCAMERR dcamcap_firetrigger		( HDCAM h, int32 iKind )
     DCAMERR dcamcap_firetrigger		( HDCAM h )
 
@@ -608,7 +617,7 @@ cdef extern from 'lib/dcamapi4.h':
     DCAMERR dcamwait_abort			( HDCAMWAIT hWait )
 
     ## utilities ##
-    int failed( DCAMERR err )
+    int failed( DCAMERR err ) nogil
     ##
     ## functions
     ##
@@ -2,7 +2,10 @@ import asyncio
 import ctypes
 import logging
 import re
-from functools import lru_cache, partial
+import threading
+import time
+from contextlib import contextmanager
+from functools import partial
 from multiprocessing.sharedctypes import RawArray
 from typing import Iterable
 from concurrent.futures import ThreadPoolExecutor
@@ -15,6 +18,10 @@ from olive.devices.error import UnsupportedClassError
 from olive.drivers.base import Driver
 from olive.utils import timeit
 
+from . import planner
+from .session import SessionRecorder, SessionWriter
+from .streaming import FrameServer
+from .threads import bind_memory, current_placement, memory_nodes
 from .wrapper import DCAM
 from .wrapper import DCAMAPI as _DCAMAPI
 from .wrapper import Capability, CaptureStatus, CaptureType, Event, Info
@@ -23,12 +30,44 @@ __all__ = ["DCAMAPI", "HamamatsuCamera"]
 
 logger = logging.getLogger(__name__)
 
-executor = ThreadPoolExecutor(max_workers=4)
+#: minimum address alignment of caller-supplied frame buffers, in bytes
+_frame_alignment = 16
+
+#: ring slots reserved for the frame DCAM-API may be writing into
+_guard_slots = 1
+
+#: read-only properties that describe the sensor itself, never invalidated
+_sensor_constants = (
+    "image_detector_pixel_width",
+    "image_detector_pixel_height",
+    "image_detector_pixel_num_horz",
+    "image_detector_pixel_num_vert",
+)
+
+_executor = None
+
+
+def get_executor():
+    """Shared worker pool for blocking driver calls, created on first use."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dcamapi")
+    return _executor
 
 
 async def sync(func, *args, **kwargs):
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+@contextmanager
+def timed(timings, phase):
+    """Record wall time of the enclosed block in seconds as timings[phase]."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = time.perf_counter() - t0
 
 
 class HamamatsuCamera(Camera):
@@ -37,8 +76,52 @@ class HamamatsuCamera(Camera):
         self._index, self._api = index, None
         self._properties = dict()
 
+        # property attributes and values of non-volatile properties, see get_property
+        self._attributes, self._values = dict(), dict()
+
+        # (binning, readout speed) -> readout time per row, see get_readout_timing
+        self._readout_timing = None
+
+        # readout regions as (pos0, shape) or a mask, see set_regions
+        self._region_capability = None
+        self._regions, self._region_mask = None, None
+
         self._event = None
 
+        self._startup_timings = dict()
+        self._is_testing = False
+
+        # wait handle and attached buffers survive unconfigure while armed, they are
+        # parked until the next configure_acquisition
+        self._armed, self._armed_layout = False, None
+        self._parked = False
+        self._acquisition_timings = dict()
+
+        # caller-supplied (N, H, W) destination, frames are attached in place
+        self._requested_out = None
+        self._destination, self._destination_index = None, 0
+        self._destination_newest = -1
+
+        # role -> ThreadPlacement, and placement achieved by each placed thread
+        self._placements, self._placed = dict(), dict()
+        # threads owned by this camera, the only ones that are ever placed
+        self._executor = None
+        self._waiter, self._waiter_thread = None, None
+        # NUMA nodes the ring pages reside on, see _bind_ring
+        self._ring_nodes = None
+
+        # callables that receive (frame, newest_index, frame_count, timestamp), the list
+        # is replaced on change, retrieval always iterates a consistent snapshot
+        self._frame_listeners, self._listeners_lock = [], threading.Lock()
+        # absolute number of the frame handed to the listeners, see _is_overwritten
+        self._frame_number = 0
+        self._recorder = None
+        self._server = None
+
+        # busy-poll retrieval, see start_polling
+        self._poller, self._polling = None, threading.Event()
+        self._polling_latency = dict()
+
     ##
 
     @property
@@ -53,31 +136,160 @@ class HamamatsuCamera(Camera):
     def is_opened(self):
         return self._api is not None
 
+    @property
+    def startup_timings(self):
+        """Duration of each phase of the last open() in seconds."""
+        return dict(self._startup_timings)
+
+    @property
+    def is_armed(self):
+        return self._armed
+
+    @property
+    def acquisition_timings(self):
+        """Duration of each setup/teardown phase of the last acquisition in seconds."""
+        return dict(self._acquisition_timings)
+
     ##
 
     async def test_open(self):
+        # a valid handle is enough, the full probe is left to open()
+        self._is_testing = True
         try:
             await super().test_open()
         except RuntimeError as err:
             logger.exception(err)
             raise UnsupportedClassError
+        finally:
+            self._is_testing = False
 
     async def _open(self):
-        handle = self.driver.api.open(self._index)  # cannot wrap in sync
-        self._api = DCAM(handle)
+        timings = self._startup_timings = dict()
+
+        with timed(timings, "open"):
+            handle = self.driver.api.open(self._index)  # cannot wrap in sync
+            self._api = DCAM(handle)
+        if self._is_testing:
+            return
 
         # probe the camera
-        await self.enumerate_properties()
+        with timed(timings, "probe"):
+            await self.enumerate_properties()
 
         # enable defect correction
-        await self.set_property("defect_correct_mode", "on")
+        with timed(timings, "defect_correct"):
+            await self.set_property("defect_correct_mode", "on")
+
+        with timed(timings, "cache"):
+            self._values = await self._sync(self._snapshot_properties, volatile=False)
+
+        logger.info(
+            f"camera {self._index} opened, "
+            + ", ".join(f"{k} {v * 1000:.1f} ms" for k, v in timings.items())
+        )
 
     async def _close(self):
+        self.stop_polling()
+        self.stop_recording()
+        self.stop_streaming()
+        self.disarm()
+
         self.driver.api.close(self.api)  # cannot wrap in sync
         self._api = None
 
     ##
 
+    def configure_threads(self, waiter=None, executor=None, writer=None):
+        """
+        Control where the threads serving this camera run.
+
+        Placements only apply to threads this camera owns, shared worker threads keep
+        their defaults. Reconfiguring replaces the owned threads, new placements never
+        stack on top of old ones.
+
+        Args:
+            waiter (ThreadPlacement, optional): a dedicated thread waits for frames, the
+                frame ring is bound to its NUMA node
+            executor (ThreadPlacement, optional): worker pool for blocking driver calls,
+                a dedicated pool is created for this camera
+            writer (ThreadPlacement, optional): recorder, streaming and other pipeline
+                threads, see place_thread
+        """
+        placements = {"waiter": waiter, "executor": executor, "writer": writer}
+        self._placements = {k: v for k, v in placements.items() if v is not None}
+
+        # placement applies to new threads only
+        self._placed = dict()
+        for pool in (self._executor, self._waiter):
+            if pool is not None:
+                pool.shutdown(wait=False)
+        self._executor, self._waiter = None, None
+        if executor is not None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=2,
+                thread_name_prefix=f"dcamapi-{self._index}",
+                initializer=self.place_thread,
+                initargs=("executor",),
+            )
+        if waiter is not None:
+            self._waiter = ThreadPoolExecutor(
+                max_workers=1,
+                thread_name_prefix=f"dcamapi-{self._index}-waiter",
+                initializer=self._init_waiter,
+            )
+
+    def place_thread(self, role):
+        """
+        Apply the placement of a role to the calling thread, only once per thread.
+
+        Only call this from threads dedicated to this camera.
+
+        Args:
+            role (str): "waiter", "executor" or "writer"
+        """
+        placed = self._placed.setdefault(role, dict())
+        thread = threading.current_thread()
+        if thread in placed:
+            return
+        try:
+            placed[thread] = self._placements[role].apply()
+        except KeyError:
+            placed[thread] = current_placement()
+
+    def thread_placement(self):
+        """
+        Placement actually achieved by the live threads serving this camera, and the
+        NUMA nodes of the frame ring pages.
+        """
+        placement = {
+            role: [p for thread, p in placed.items() if thread.is_alive()]
+            for role, placed in self._placed.items()
+        }
+        if self._ring_nodes is not None:
+            placement["ring"] = self._ring_nodes
+        return placement
+
+    def _init_waiter(self):
+        self._waiter_thread = threading.current_thread()
+        self.place_thread("waiter")
+
+    def _is_off_waiter(self):
+        """Whether retrieval has to be handed over to the dedicated waiter thread."""
+        return (
+            self._waiter is not None
+            and threading.current_thread() is not self._waiter_thread
+        )
+
+    async def _sync(self, func, *args, **kwargs):
+        if self._executor is None:
+            return await sync(func, *args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    ##
+
     async def get_device_info(self) -> DeviceInfo:
         params = {
             "version": Info.APIVersion,
@@ -86,42 +298,60 @@ class HamamatsuCamera(Camera):
             "serial_number": Info.CameraID,
         }
         for key, value in params.items():
-            params[key] = await sync(self.api.get_string, value)
+            params[key] = await self._sync(self.api.get_string, value)
 
         # serial number requires further parsing
         parsed_sn = re.match(r"S/N: (\d+)", params["serial_number"]).group(1)
         params["serial_number"] = parsed_sn
 
-        # DEBUG
         for option in (Capability.Region, Capability.FrameOption, Capability.LUT):
             try:
-                print(self.api.get_capability(option))
+                logger.debug(f"{option.name}, {self.api.get_capability(option)}")
             except RuntimeError as err:
-                logger.error(err)
+                logger.debug(f"{option.name}, {err}")
 
         return DeviceInfo(**params)
 
     ##
 
     async def enumerate_properties(self):
+        # walk the entire property list in a single executor hop
+        self._properties = await self._sync(self._probe_properties)
+        self._attributes, self._values = dict(), dict()
+        self._readout_timing = None
+        self._region_capability = None
+        self._regions, self._region_mask = None, None
+        return tuple(self._properties.keys())
+
+    def _probe_properties(self):
         properties = dict()
 
         curr_id, next_id = -1, self.api.get_next_id()
         while curr_id != next_id:
             try:
-                curr_id, next_id = next_id, await sync(self.api.get_next_id, next_id)
+                curr_id, next_id = next_id, self.api.get_next_id(next_id)
             except RuntimeError:
                 # no more supported property id
                 break
 
-            name = await sync(self.api.get_name, curr_id)
+            name = self.api.get_name(curr_id)
             name = name.lower().replace(" ", "_")
             properties[name] = curr_id
 
-        self._properties = properties
-        return tuple(properties.keys())
+        return properties
 
     async def get_property(self, name):
+        """
+        Read a property.
+
+        Non-volatile values are served from the cache, which is populated on open and
+        kept up-to-date by set_property.
+        """
+        try:
+            return self._values[name]
+        except KeyError:
+            pass
+
         attributes = self._get_property_attributes(name)
         if not attributes["readable"]:
             raise TypeError(f'property "{name}" is not readable')
@@ -131,18 +361,19 @@ class HamamatsuCamera(Camera):
                 f"an array property with {attributes['n_elements']} element(s), NOT IMPLEMENTED"
             )
 
+        value = await self._read_value(name)
+        if self._is_cacheable(attributes):
+            self._values[name] = value
+        return value
+
+    async def _read_value(self, name):
+        """Read a property from the device, bypassing the cache."""
+        attributes = self._get_property_attributes(name)
         # convert data type
-        prop_type, prop_id = attributes["type"], self._get_property_id(name)
+        prop_id = self._get_property_id(name)
 
-        value = await sync(self.api.get_value, prop_id)
-        if prop_type == "mode":
-            # NOTE assuming uniform step
-            index = int(value) - int(attributes["min"])
-            return attributes["modes"][index]
-        elif prop_type == "long":
-            return int(value)
-        elif prop_type == "real":
-            return float(value)
+        value = await self._sync(self.api.get_value, prop_id)
+        return self._decode_value(attributes, value)
 
     async def set_property(self, name, value):
         attributes = self._get_property_attributes(name)
@@ -154,12 +385,74 @@ class HamamatsuCamera(Camera):
             # translate string enum back to index
             # NOTE assuming uniform step
             value = attributes["modes"].index(value) + int(attributes["min"])
-        await sync(self.api.set_value, prop_id, value)
+        value = await self._sync(self.api.set_get_value, prop_id, value)
+
+        if attributes["data_stream"]:
+            if self._parked:
+                # parked acquisition resources no longer match the frame layout
+                self._release_acquisition()
+            # regions are relative to a frame that no longer exists
+            await self.clear_regions()
+
+        self._invalidate_values(attributes)
+        if self._is_cacheable(attributes):
+            # cache the value actually applied by the device
+            self._values[name] = self._decode_value(attributes, value)
 
     def _get_property_id(self, name):
         return self._properties[name]
 
-    @lru_cache(maxsize=16)
+    @staticmethod
+    def _decode_value(attributes, value):
+        """Convert raw property value to its Python representation."""
+        prop_type = attributes["type"]
+        if prop_type == "mode":
+            # NOTE assuming uniform step
+            index = int(value) - int(attributes["min"])
+            return attributes["modes"][index]
+        elif prop_type == "long":
+            return int(value)
+        elif prop_type == "real":
+            return float(value)
+
+    @staticmethod
+    def _is_cacheable(attributes):
+        return not (attributes["volatile"] or attributes["is_array"])
+
+    def _invalidate_values(self, attributes):
+        """
+        Drop cached values that may depend on a property that has just changed.
+
+        - read-only values are derived, e.g. frame rate, they are dropped on any write,
+          except the sensor constants
+        - data stream values depend on each other, e.g. subarray size and position
+        - the remaining writable values only change when written
+        """
+        data_stream = attributes["data_stream"]
+        for name in list(self._values.keys()):
+            if name in _sensor_constants:
+                continue
+            other = self._get_property_attributes(name)
+            if not other["writable"] or (data_stream and other["data_stream"]):
+                del self._values[name]
+
+    def _snapshot_properties(self, volatile=True):
+        """Read all readable scalar properties, blocking."""
+        values = dict()
+        for name, prop_id in self._properties.items():
+            attributes = self._get_property_attributes(name)
+            if not attributes["readable"] or attributes["is_array"]:
+                continue
+            if attributes["volatile"] and not volatile:
+                continue
+            try:
+                value = self.api.get_value(prop_id)
+            except RuntimeError:
+                # not accessible in current state
+                continue
+            values[name] = self._decode_value(attributes, value)
+        return values
+
     def _get_property_attributes(self, name):
         """
         Attributes define the characteristic of a property.
@@ -182,34 +475,188 @@ class HamamatsuCamera(Camera):
         Args:
             name (str): name of the property
         """
-        logger.debug(f"attributes of {name} cache missed")
+        try:
+            return self._attributes[name]
+        except KeyError:
+            logger.debug(f"attributes of {name} cache missed")
         prop_id = self._get_property_id(name)
-        return self.api.get_attr(prop_id)
+        attributes = self._attributes[name] = self.api.get_attr(prop_id)
+        return attributes
 
     ##
 
-    async def configure_acquisition(self, n_frames, continuous=False):
-        # create buffer
-        await super().configure_acquisition(n_frames, continuous)
+    def arm(self):
+        """
+        Keep the wait handle and the attached buffers alive across acquisitions.
+
+        While armed, consecutive acquisitions with identical layout only start, wait
+        and stop the capture. Writing any data stream property (ROI, pixel type...)
+        releases the parked resources.
+        """
+        self._armed = True
+
+    def disarm(self):
+        self._armed = False
+        if self._parked:
+            self._release_acquisition()
+
+    async def configure_acquisition(self, n_frames, continuous=False, out=None):
+        """
+        Args:
+            n_frames (int): number of frames
+            continuous (bool, optional): acquire in a ring until stopped
+            out (np.ndarray, optional): (N, H, W) destination, including np.memmap,
+                DCAM-API writes frames directly into its slices
+        """
+        if out is None:
+            out = self._requested_out
+        if out is not None and continuous:
+            raise ValueError("destination array requires a finite acquisition")
+
+        timings = self._acquisition_timings = dict()
+        with timed(timings, "configure"):
+            layout = (n_frames, continuous)
+            if out is not None:
+                layout += (out.__array_interface__["data"][0], out.shape)
+
+            if self._event is not None:
+                if self._parked and self._armed and self._armed_layout == layout:
+                    # resources are parked, only rewind
+                    self._parked = False
+                    self._rewind()
+                    return
+                self._release_acquisition()
+
+            if out is not None:
+                self._destination = await self._validate_destination(out, n_frames)
+                self._rewind()
 
-        # create event handle
-        self._event = self.api.event
-        self._event.open()
+            # create buffer
+            await super().configure_acquisition(n_frames, continuous)
+
+            # create event handle
+            self._event = self.api.event
+            self._event.open()
+
+            self._armed_layout = layout
+
+            if self._server is not None and self._destination is None:
+                try:
+                    self._check_queue_depth(self._server.queue_depth)
+                except ValueError:
+                    self._release_acquisition()
+                    raise
 
     async def _configure_frame_buffer(self, n_frames):
         """Attach buffer to DCAM-API internals."""
+        if self._destination is not None:
+            # frames land in the destination, no need for the ring
+            self.api.attach(
+                [frame.reshape(-1).view(np.uint8) for frame in self._destination]
+            )
+            return
+
         await super()._configure_frame_buffer(n_frames)
+        placement = self._placements.get("waiter")
+        if placement is not None and placement.numa_node is not None:
+            self._bind_ring(self.buffer.frames, placement.numa_node)
         self.api.attach(self.buffer.frames)
 
+    def _bind_ring(self, frames, node):
+        """
+        Move the frame pages to the NUMA node of the waiter.
+
+        The ring is zero-filled on allocation, its pages are already faulted in on the
+        allocating thread, therefore they are migrated rather than first-touched. Frames
+        are not page-aligned, the pages a frame shares with its neighbours stay put.
+        """
+        try:
+            bind_memory(frames, node)
+        except OSError as err:
+            logger.warning(f"unable to bind the ring to NUMA node {node}, {err}")
+        try:
+            self._ring_nodes = memory_nodes(frames)
+        except OSError as err:
+            logger.warning(f"unable to locate the ring pages, {err}")
+            self._ring_nodes = None
+        logger.debug(f"ring pages per NUMA node, {self._ring_nodes}")
+
+    async def _validate_destination(self, out, n_frames):
+        """Ensure every slice of the destination can serve as a DCAM frame buffer."""
+        if not isinstance(out, np.ndarray) or out.ndim != 3:
+            raise ValueError("destination has to be an (N, H, W) array")
+        if len(out) < n_frames:
+            raise ValueError(
+                f"destination holds {len(out)} frame(s), {n_frames} requested"
+            )
+        if not out.flags.writeable:
+            raise ValueError("destination is read-only")
+
+        dtype = await self.get_dtype()
+        shape = (
+            await self.get_property("image_height"),
+            await self.get_property("image_width"),
+        )
+        if out.dtype != dtype or out.shape[1:] != shape:
+            raise ValueError(
+                f"destination frame is {out.shape[1:]} {out.dtype}, "
+                f"expecting {shape} {np.dtype(dtype)}"
+            )
+        rowbytes = await self.get_property("image_rowbytes")
+        if rowbytes != shape[1] * out.itemsize:
+            raise ValueError(f"padded rows ({rowbytes} bytes) are not supported")
+
+        frames = out[:n_frames]
+        if not frames[0].flags.c_contiguous:
+            raise ValueError("destination frames have to be C-contiguous")
+        for i, frame in enumerate(frames):
+            if frame.ctypes.data % _frame_alignment:
+                raise ValueError(
+                    f"destination frame {i} is not aligned to {_frame_alignment} bytes"
+                )
+        return frames
+
+    async def sequence(self, n_frames, out=None):
+        """
+        Acquire a sequence of frames.
+
+        Args:
+            n_frames (int): number of frames
+            out (np.ndarray, optional): (N, H, W) destination, including np.memmap,
+                yielded frames are views of its slices
+        """
+        self._requested_out = out
+        try:
+            async for frame in super().sequence(n_frames):
+                yield frame
+        finally:
+            self._requested_out = None
+
+    def _rewind(self):
+        if self._destination is not None:
+            self._destination_index, self._destination_newest = 0, -1
+        else:
+            self.buffer._read_index, self.buffer._write_index = 0, 0
+            self.buffer._is_full = False
+
     def start_acquisition(self):
         mode = CaptureType.Sequence if self.continuous else CaptureType.Snap
-        self.api.start(mode)
+        with timed(self._acquisition_timings, "start"):
+            self.api.start(mode)
         logger.debug(f"acquisition STARTED")
 
     def _retrieve_frame(self, mode: BufferRetrieveMode):
+        if self._is_off_waiter():
+            # wait on the dedicated thread, its placement never leaks into shared ones
+            return self._waiter.submit(self._retrieve_frame, mode).result()
+
+        if self._destination is not None:
+            return self._retrieve_destination_frame(mode)
+
         self._event.start(Event.FrameReady)
+        timestamp = time.perf_counter()
 
-        latest_index, n_frames = self.api.transfer_info
+        latest_index, n_frames = self.api.transfer_info()
 
         """
         # DCAM-API writes directly to the buffer, dummy write
@@ -274,26 +721,323 @@ class HamamatsuCamera(Camera):
             #   -----------R---W
 
         # since DCAM-API write directly into buffer list, use read to pull it out
-        return self.buffer.read()
+        slot, capacity = self.buffer._read_index, self.buffer.capacity()
+        frame = self.buffer.read()
+        self._frame_number = n_frames - 1 - (latest_index - slot) % capacity
+        self._notify_frame(frame, latest_index, n_frames, timestamp)
+        return frame
+
+    def _retrieve_destination_frame(self, mode: BufferRetrieveMode):
+        """Frames are captured in snap mode, one destination slice per frame."""
+        index = self._destination_index
+        if index >= len(self._destination):
+            raise IndexError("destination is full")
+
+        timestamp = time.perf_counter()
+        if mode == BufferRetrieveMode.Latest or index > self._destination_newest:
+            self._event.start(Event.FrameReady)
+            timestamp = time.perf_counter()
+        latest_index, n_frames = self.api.transfer_info()
+        self._destination_newest = latest_index
+
+        if mode == BufferRetrieveMode.Latest:
+            # fast forward
+            index = latest_index
+        self._destination_index = index + 1
+
+        frame = self._destination[index]
+        self._frame_number = index
+        self._notify_frame(frame, latest_index, n_frames, timestamp)
+        return frame
+
+    def add_frame_listener(self, listener):
+        """
+        Args:
+            listener (callable): listener(frame, newest_index, frame_count, timestamp),
+                called from the retrieval thread for every retrieved frame
+        """
+        with self._listeners_lock:
+            self._frame_listeners = self._frame_listeners + [listener]
+
+    def remove_frame_listener(self, listener):
+        with self._listeners_lock:
+            listeners = list(self._frame_listeners)
+            listeners.remove(listener)
+            self._frame_listeners = listeners
+
+    def _notify_frame(self, frame, newest_index, frame_count, timestamp):
+        for listener in self._frame_listeners:
+            listener(frame, newest_index, frame_count, timestamp)
+
+    def _is_overwritten(self, k):
+        """Whether the ring slot of frame k may have been reused, from the live count."""
+        buffer = getattr(self, "buffer", None)
+        if self._destination is not None or buffer is None:
+            return False
+        try:
+            n_captured = self.api.transfer_info()[1]
+        except RuntimeError:
+            # capture is released, nothing writes into the slots anymore
+            return False
+        return n_captured - k > buffer.capacity() - _guard_slots
 
     def stop_acquisition(self):
-        self.api.stop()
-        self._event.start(Event.Stopped)
+        with timed(self._acquisition_timings, "stop"):
+            self.api.stop()
+            self._event.start(Event.Stopped)
         logger.debug("acquisition STOPPED")
 
     def unconfigure_acquisition(self):
+        timings = self._acquisition_timings
+        with timed(timings, "unconfigure"):
+            if self._armed:
+                self._parked = True
+            else:
+                self._release_acquisition()
+
+        overhead = sum(timings.values()) * 1000
+        logger.debug(
+            f"acquisition overhead {overhead:.2f} ms ("
+            + ", ".join(f"{k} {v * 1000:.2f} ms" for k, v in timings.items())
+            + ")"
+        )
+
+    def _release_acquisition(self):
         # cleanup event handle
         self._event.close()
         self._event = None
+        self._armed_layout, self._parked = None, False
 
         # detach
         self.api.release()
+        self._destination = None
 
         # free buffer
         super().unconfigure_acquisition()
 
     ##
 
+    @property
+    def is_polling(self):
+        return self._poller is not None
+
+    @property
+    def polling_latency(self):
+        """
+        Latency statistics of the busy-poll retrieval in ms.
+
+        - callback: from the detection of a new frame to the return of the callback
+        """
+        return {
+            key: dict(value) if isinstance(value, dict) else value
+            for key, value in self._polling_latency.items()
+        }
+
+    async def start_polling(self, callback, n_spin=1000, n_yield=1000, timeout=1.0):
+        """
+        Hand over the newest frame the moment it arrives, bypassing the wait handle.
+
+        A dedicated thread with the waiter placement spins on the transfer info with
+        the GIL released. Acquisition has to be configured and started already, do not
+        retrieve frames through grab()/sequence() at the same time.
+
+        Args:
+            callback (callable): callback(frame, newest_index, frame_count, timestamp),
+                called from the polling thread with a view of the newest frame
+            n_spin (int, optional): polls that keep spinning on the CPU
+            n_yield (int, optional): following polls that yield the CPU in between
+            timeout (float, optional): seconds without a new frame before giving up, the
+                polling thread also ends on any error
+        """
+        if self.is_polling:
+            raise RuntimeError("already polling")
+
+        if self._destination is not None:
+            frames = self._destination
+        else:
+            shape = (
+                await self.get_property("image_height"),
+                await self.get_property("image_width"),
+            )
+            dtype = await self.get_dtype()
+            frames = [
+                np.asarray(frame).view(dtype).reshape(shape)
+                for frame in self.buffer.frames
+            ]
+
+        self._polling_latency = {
+            "frames": 0,
+            "skipped": 0,
+            "callback": {"min": float("inf"), "mean": 0.0, "max": 0.0},
+        }
+        self._polling.set()
+        poller = self._poller = threading.Thread(
+            target=self._poll,
+            args=(callback, frames, n_spin, n_yield, timeout),
+            name="dcamapi-poll",
+            daemon=True,
+        )
+        poller.start()
+
+    def stop_polling(self):
+        poller = self._poller
+        if poller is None:
+            return
+        self._polling.clear()
+        poller.join()
+
+    def _poll(self, callback, frames, n_spin, n_yield, timeout):
+        self.place_thread("waiter")
+
+        statistics = self._polling_latency
+        try:
+            last_count, t_last = self.api.transfer_info()[1], time.perf_counter()
+            while self._polling.is_set():
+                result = self.api.poll_transfer(last_count, n_spin, n_yield)
+                t_detect = time.perf_counter()
+                if result is None:
+                    if t_detect - t_last > timeout:
+                        logger.error(f"no frame in {timeout} s, stop polling")
+                        break
+                    continue
+                newest_index, frame_count = result
+                statistics["skipped"] += frame_count - last_count - 1
+                last_count, t_last = frame_count, t_detect
+
+                callback(frames[newest_index], newest_index, frame_count, t_detect)
+
+                # end-to-end, the callback included
+                dt = time.perf_counter() - t_detect
+                self._update_latency(statistics["callback"], dt)
+                statistics["frames"] += 1
+        except Exception:
+            logger.exception("polling stopped on error")
+        finally:
+            self._poller = None
+            logger.info(
+                f"polled {statistics['frames']} frame(s), "
+                f"{statistics['skipped']} skipped, mean callback latency "
+                f"{statistics['callback']['mean']:.3f} ms"
+            )
+
+    def _update_latency(self, latency, dt):
+        dt *= 1000
+        n = self._polling_latency["frames"]
+        latency["min"] = min(latency["min"], dt)
+        latency["max"] = max(latency["max"], dt)
+        latency["mean"] += (dt - latency["mean"]) / (n + 1)
+
+    ##
+
+    @property
+    def is_recording(self):
+        return self._recorder is not None
+
+    async def start_recording(self, path):
+        """
+        Record the following acquisitions into a session file.
+
+        Property state is captured now, every retrieved frame is appended along with its
+        event timing and transfer info. Frames are written by a worker thread with the
+        writer placement, frames overwritten in the ring before that are skipped. Use
+        ReplayCamera to play it back.
+
+        Args:
+            path (str): path of the session file
+        """
+        if self.is_recording:
+            raise RuntimeError(f'already recording to "{self._recorder.path}"')
+
+        info = {
+            "version": Info.APIVersion,
+            "vendor": Info.Vendor,
+            "model": Info.Model,
+            "serial_number": Info.CameraID,
+        }
+        for key, value in info.items():
+            info[key] = await self._sync(self.api.get_string, value)
+        properties = await self._sync(self._snapshot_properties)
+
+        self._recorder = SessionRecorder(
+            SessionWriter(path, properties, info),
+            is_overwritten=self._is_overwritten,
+            thread_initializer=partial(self.place_thread, "writer"),
+        )
+        self.add_frame_listener(self._record_frame)
+
+    def stop_recording(self):
+        if self._recorder is None:
+            return
+        self.remove_frame_listener(self._record_frame)
+        recorder, self._recorder = self._recorder, None
+        # frames still queued are written before the file is closed
+        recorder.close()
+
+    def _record_frame(self, frame, newest_index, frame_count, timestamp):
+        recorder = self._recorder
+        if recorder is not None:
+            k = self._frame_number
+            recorder.put(k, frame, newest_index, frame_count, timestamp)
+
+    ##
+
+    @property
+    def is_streaming(self):
+        return self._server is not None
+
+    def start_streaming(self, address, queue_depth=4):
+        """
+        Publish retrieved frames to socket clients, see FrameClient.
+
+        Frames are sent straight from the ring slots by per-client threads with the
+        writer placement, retrieval never waits for a client. Slots reused by DCAM-API
+        before or while they are sent are dropped.
+
+        Args:
+            address (str or tuple): path of a Unix domain socket, or (host, port)
+            queue_depth (int, optional): frames a lossless client may lag behind
+
+        Returns:
+            (FrameServer) the running server
+        """
+        if self.is_streaming:
+            raise RuntimeError(f"already streaming on {self._server.address}")
+
+        if self._destination is None:
+            self._check_queue_depth(queue_depth)
+
+        self._server = FrameServer(
+            address,
+            queue_depth=queue_depth,
+            thread_initializer=partial(self.place_thread, "writer"),
+            is_overwritten=self._is_overwritten,
+        )
+        self._server.start()
+        self.add_frame_listener(self._publish_frame)
+        return self._server
+
+    def stop_streaming(self):
+        if self._server is None:
+            return
+        self.remove_frame_listener(self._publish_frame)
+        self._server.stop()
+        self._server = None
+
+    def _publish_frame(self, frame, newest_index, frame_count, timestamp):
+        server = self._server
+        if server is not None:
+            server.publish(frame, self._frame_number, timestamp)
+
+    def _check_queue_depth(self, queue_depth):
+        """Lossless clients have to lag behind less than the ring, once it exists."""
+        buffer = getattr(self, "buffer", None)
+        if buffer is not None and queue_depth >= buffer.capacity() - _guard_slots:
+            raise ValueError(
+                f"queue depth has to be smaller than the ring ({buffer.capacity()})"
+            )
+
+    ##
+
     async def get_dtype(self):
         pixel_type = await self.get_property("image_pixel_type")
         try:
@@ -325,6 +1069,136 @@ class HamamatsuCamera(Camera):
         )
         return pos0, shape
 
+    async def get_region_capability(self):
+        """
+        Region types supported by the camera, along with the horizontal and vertical
+        units a region has to align to.
+        """
+        if self._region_capability is None:
+            try:
+                capability = await self._sync(
+                    self.api.get_capability, Capability.Region
+                )
+            except RuntimeError:
+                capability = {"type": "none"}
+            if capability["type"] == "none":
+                capability = {
+                    "type": [],
+                    "units": {"horizontal": 1, "vertical": 1},
+                }
+            self._region_capability = capability
+        return self._region_capability
+
+    async def set_regions(self, regions):
+        """
+        Restrict readout to multiple rectangular regions inside the ROI.
+
+        Regions are programmed into the camera when it supports rectangle arrays,
+        otherwise they are cropped on the host, see split_regions. Writing a data stream
+        property, e.g. binning or the ROI, clears them.
+
+        Args:
+            regions (list of tuple): (pos0, shape) of each region, relative to the ROI
+        """
+        frame_shape = (
+            await self.get_property("image_height"),
+            await self.get_property("image_width"),
+        )
+        capability = await self.get_region_capability()
+        units = (capability["units"]["vertical"], capability["units"]["horizontal"])
+
+        regions = [(tuple(pos0), tuple(shape)) for pos0, shape in regions]
+        aligned = True
+        for pos0, shape in regions:
+            if any(s <= 0 for s in shape):
+                raise ValueError(
+                    f"region {pos0[::-1]} has an empty shape {shape[::-1]}"
+                )
+            pos1 = tuple(p + s for p, s in zip(pos0, shape))
+            if any(p < 0 for p in pos0) or any(
+                p > ms for p, ms in zip(pos1, frame_shape)
+            ):
+                raise ValueError(f"region {pos0[::-1]}->{pos1[::-1]} out-of-bound")
+            aligned &= all(v % u == 0 for v, u in zip(pos0 + pos1, units * 2))
+
+        await self.clear_regions()
+
+        if "rect16array" in capability["type"] and aligned:
+            # (left, top, right, bottom), right and bottom are exclusive
+            rects = [(x0, y0, x0 + nx, y0 + ny) for (y0, x0), (ny, nx) in regions]
+            try:
+                await self._sync(self.api.set_region, rects=rects)
+            except RuntimeError as err:
+                logger.warning(f"unable to set hardware regions, {err}")
+        else:
+            logger.debug("regions are cropped on the host")
+        self._regions = regions
+
+    async def set_region_mask(self, mask):
+        """
+        Restrict readout to the non-zero pixels of a mask.
+
+        Args:
+            mask (np.ndarray): boolean mask with the shape of the frame
+        """
+        frame_shape = (
+            await self.get_property("image_height"),
+            await self.get_property("image_width"),
+        )
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != frame_shape:
+            raise ValueError(f"mask has to be {frame_shape}, not {mask.shape}")
+
+        capability = await self.get_region_capability()
+        uy, ux = capability["units"]["vertical"], capability["units"]["horizontal"]
+
+        await self.clear_regions()
+
+        if "bytemask" in capability["type"]:
+            # one byte per unit block, all pixels in a block have to agree
+            coarse = mask[::uy, ::ux]
+            expanded = np.repeat(np.repeat(coarse, uy, axis=0), ux, axis=1)
+            if np.array_equal(expanded[: mask.shape[0], : mask.shape[1]], mask):
+                try:
+                    await self._sync(self.api.set_region, mask=coarse.astype(np.uint8))
+                except RuntimeError as err:
+                    logger.warning(f"unable to set hardware mask, {err}")
+            else:
+                logger.debug(f"mask is not aligned to ({uy}, {ux}), masked on the host")
+        else:
+            logger.debug("mask is applied on the host")
+        self._region_mask = mask
+
+    async def clear_regions(self):
+        if self._regions is None and self._region_mask is None:
+            return
+        self._regions, self._region_mask = None, None
+
+        capability = await self.get_region_capability()
+        if capability["type"]:
+            try:
+                await self._sync(self.api.set_region)
+            except RuntimeError as err:
+                logger.warning(f"unable to clear hardware regions, {err}")
+
+    def split_regions(self, frame):
+        """
+        Views of the configured regions in a retrieved frame, nothing is copied.
+
+        Returns:
+            (list of np.ndarray) one view per region, or a masked array with the
+            pixels outside the mask hidden, or the frame itself if nothing is set
+        """
+        if self._regions is not None:
+            return [
+                frame[y0 : y0 + ny, x0 : x0 + nx]
+                for (y0, x0), (ny, nx) in self._regions
+            ]
+        elif self._region_mask is not None:
+            return np.ma.masked_array(frame, mask=~self._region_mask, copy=False)
+        else:
+            return frame
+
     async def set_roi(self, pos0=None, shape=None):
         """
         Set region-of-interest.
@@ -333,6 +1207,9 @@ class HamamatsuCamera(Camera):
             pos0 (tuple, optional): top-left position
             shape (tuple, optional): shape of the ROI
         """
+        # regions are relative to the ROI
+        await self.clear_regions()
+
         # save prior roi
         prev_pos0, prev_shape = await self.get_roi()
 
@@ -369,7 +1246,7 @@ class HamamatsuCamera(Camera):
                 for name, value in zip(("subarray_vsize", "subarray_hsize"), shape):
                     await self.set_property(name, value)
                 # re-enable
-                self.set_property("subarray_mode", "on")
+                await self.set_property("subarray_mode", "on")
             except RuntimeError:
                 pos1 = tuple(p + (s - 1) for p, s in zip(pos0, shape))
                 raise ValueError(
@@ -380,22 +1257,142 @@ class HamamatsuCamera(Camera):
             await self.set_roi(pos0=prev_pos0, shape=prev_shape)
             raise
 
+    ##
+
+    async def get_readout_timing(self):
+        """
+        Readout time per sensor row in s, for each (binning, readout speed).
+
+        Measured once by cycling through the binning modes and readout speeds, the
+        original settings are restored afterwards.
+        """
+        if self._readout_timing is None:
+            self._readout_timing = await self._measure_readout_timing()
+        return self._readout_timing
+
+    async def _measure_readout_timing(self):
+        binnings, speeds = (None,), (None,)
+        if "binning" in self._properties:
+            binnings = self._get_property_attributes("binning")["modes"]
+        if "readout_speed" in self._properties:
+            attributes = self._get_property_attributes("readout_speed")
+            step = int(attributes.get("step", 1)) or 1
+            speeds = range(int(attributes["min"]), int(attributes["max"]) + 1, step)
+
+        previous = {
+            name: await self.get_property(name)
+            for name in ("binning", "readout_speed")
+            if name in self._properties
+        }
+        timing = dict()
+        try:
+            for binning in binnings:
+                try:
+                    if binning is not None:
+                        await self.set_property("binning", binning)
+                except RuntimeError:
+                    logger.debug(f'binning "{binning}" is not available')
+                    continue
+                for speed in speeds:
+                    if speed is not None:
+                        await self.set_property("readout_speed", speed)
+                    readout_time = await self._read_value("timing_readout_time")
+                    rows = await self._read_value("image_height")
+                    rows *= planner.binning_factor(binning)
+                    timing[(binning, speed)] = readout_time / rows
+        finally:
+            for name, value in previous.items():
+                await self.set_property(name, value)
+
+        logger.debug(f"readout timing, {timing}")
+        return timing
+
+    async def plan_frame_rate(
+        self, frame_rate, shape=None, exposure_time=None, apply=False
+    ):
+        """
+        Find the ROI, binning and readout speed that reach a frame rate.
+
+        Computed from the cached property ranges and the readout timing. The first call
+        measures the timing, which writes every binning and readout speed combination
+        before restoring them, later calls only touch the device to apply the result.
+
+        Args:
+            frame_rate (float): target frame rate in Hz
+            shape (tuple, optional): minimum field of view in sensor pixels, (y, x),
+                default to the entire sensor
+            exposure_time (float, optional): in ms, default to current exposure time
+            apply (bool, optional): apply the configuration
+
+        Returns:
+            (FramePlan) the chosen configuration
+        """
+        max_shape = await self.get_max_roi_shape()
+        if shape is None:
+            shape = max_shape
+        if exposure_time is None:
+            exposure_time = await self.get_exposure_time()
+        steps = tuple(
+            int(self._get_property_attributes(name).get("step", 1)) or 1
+            for name in ("subarray_vsize", "subarray_hsize")
+        )
+        timing = await self.get_readout_timing()
+
+        frame_plan = planner.plan(
+            frame_rate, tuple(shape), exposure_time, max_shape, steps, timing
+        )
+        logger.info(f"planned {frame_plan}")
+
+        if apply:
+            await self.apply_frame_plan(frame_plan)
+        return frame_plan
+
+    async def apply_frame_plan(self, frame_plan):
+        """Apply a FramePlan, see plan_frame_rate."""
+        if frame_plan.binning is not None:
+            await self.set_property("binning", frame_plan.binning)
+        if frame_plan.readout_speed is not None:
+            await self.set_property("readout_speed", frame_plan.readout_speed)
+        await self.set_roi(pos0=frame_plan.pos0, shape=frame_plan.shape)
+        await self.set_exposure_time(frame_plan.exposure_time)
+
+        if "internal_frame_rate" in self._properties:
+            actual = await self._read_value("internal_frame_rate")
+            logger.info(
+                f"frame rate {actual:.2f} Hz, planned {frame_plan.frame_rate:.2f} Hz"
+            )
+
 
 class DCAMAPI(Driver):
-    api = None
+    _api = None
 
     def __init__(self):
-        # ensure API is only instantiated once
-        if self.api is None:
-            logger.info(f"loading DCAM-API")
-            self.api = _DCAMAPI()
         super().__init__()
+        self._startup_timings = dict()
+
+    ##
+
+    @property
+    def api(self):
+        # ensure API is only instantiated once, and not before it is needed
+        if DCAMAPI._api is None:
+            logger.info(f"loading DCAM-API")
+            with timed(self._startup_timings, "load"):
+                DCAMAPI._api = _DCAMAPI()
+        return DCAMAPI._api
+
+    @property
+    def startup_timings(self):
+        """Duration of each driver startup phase in seconds."""
+        return dict(self._startup_timings)
 
     ##
 
     async def initialize(self):
+        api = self.api
         try:
-            await sync(self.api.init)
+            with timed(self._startup_timings, "init"):
+                await sync(api.init)
         except RuntimeError as err:
             if "No cameras" not in str(err):
                 logger.debug(f"no camera found")
@@ -404,6 +1401,33 @@ class DCAMAPI(Driver):
     async def shutdown(self):
         await sync(self.api.uninit)
 
+    async def enumerate_devices(self) -> Iterable[HamamatsuCamera]:
+        """Test all the candidates, only the device handle is opened."""
+        with timed(self._startup_timings, "enumerate"):
+            candidates = self._enumerate_device_candidates()
+            results = await asyncio.gather(
+                *[candidate.test_open() for candidate in candidates],
+                return_exceptions=True,
+            )
+
+        devices = []
+        for candidate, result in zip(candidates, results):
+            if isinstance(result, UnsupportedClassError):
+                continue
+            elif isinstance(result, Exception):
+                raise result
+            devices.append(candidate)
+        return devices
+
+    async def open_devices(self, devices: Iterable[HamamatsuCamera]):
+        """
+        Open multiple cameras.
+
+        Device handles are opened one at a time on the calling thread, the property
+        probes that follow run concurrently.
+        """
+        await asyncio.gather(*[device.open() for device in devices])
+
     def _enumerate_device_candidates(self) -> Iterable[HamamatsuCamera]:
         n_devices = self.api.n_devices
         logger.debug(f"found {n_devices} camera(s)")
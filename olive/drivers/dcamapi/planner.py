@@ -0,0 +1,112 @@
+"""
+Frame rate planning.
+
+Rolling readout takes a fixed time per sensor row for a given readout speed and
+binning, the frame period is therefore
+
+    max(exposure time, rows * readout time per row)
+
+for a vertically centered subarray. Per-row readout times are measured once per
+camera, the search itself never touches the device.
+"""
+
+import logging
+from collections import namedtuple
+from math import gcd
+
+__all__ = ["FramePlan", "frame_rate", "plan"]
+
+logger = logging.getLogger(__name__)
+
+FramePlan = namedtuple(
+    "FramePlan",
+    ["pos0", "shape", "binning", "readout_speed", "exposure_time", "frame_rate"],
+)
+FramePlan.__doc__ = """
+Camera configuration for a target frame rate.
+
+- pos0, shape: centered subarray in sensor pixels, (y, x)
+- binning: mode name, e.g. "2x2"
+- readout_speed: readout speed value, None if not supported
+- exposure_time: in ms
+- frame_rate: achievable frame rate in Hz
+"""
+
+
+def binning_factor(binning):
+    """Binning factor of a mode name, e.g. "2x2" -> 2."""
+    if binning is None:
+        return 1
+    return int(str(binning).lower().split("x")[0])
+
+
+def _align(value, step, upper):
+    """Round up to a multiple of step, clipped to the largest multiple within upper."""
+    value = -(-value // step) * step
+    return min(value, upper // step * step)
+
+
+def frame_rate(rows, exposure_time, row_time):
+    """
+    Args:
+        rows (int): subarray height in sensor rows
+        exposure_time (float): in ms
+        row_time (float): readout time per row in s
+    """
+    return 1.0 / max(exposure_time / 1000, rows * row_time)
+
+
+def plan(target, shape, exposure_time, max_shape, steps, timing):
+    """
+    Find the configuration with the best image quality that reaches a frame rate.
+
+    Smaller binning wins, then slower (less noisy) readout, then faster frame rate.
+
+    Args:
+        target (float): frame rate in Hz
+        shape (tuple): minimum field of view in sensor pixels, (y, x)
+        exposure_time (float): in ms
+        max_shape (tuple): detector size, (y, x)
+        steps (tuple): subarray size step, (y, x)
+        timing (dict): (binning, readout_speed) -> readout time per row in s
+
+    Returns:
+        (FramePlan) the chosen configuration
+    """
+    if exposure_time / 1000 > 1 / target:
+        raise ValueError(
+            f"exposure time {exposure_time} ms exceeds the frame period of {target} Hz"
+        )
+    if any(s > ms for s, ms in zip(shape, max_shape)):
+        raise ValueError(f"field of view {shape} exceeds the detector {max_shape}")
+
+    candidates, best_rate = [], None
+    for (binning, speed), row_time in timing.items():
+        factor = binning_factor(binning)
+        units = [step * factor // gcd(step, factor) for step in steps]
+        aligned = [_align(s, u, ms) for s, u, ms in zip(shape, units, max_shape)]
+        if any(a < s for a, s in zip(aligned, shape)):
+            # unable to cover the field of view with this binning
+            continue
+
+        rate = frame_rate(aligned[0], exposure_time, row_time)
+        best_rate = rate if best_rate is None else max(best_rate, rate)
+        if rate < target:
+            continue
+
+        pos0 = tuple(
+            (ms - a) // 2 // u * u for ms, a, u in zip(max_shape, aligned, units)
+        )
+        candidate = FramePlan(pos0, tuple(aligned), binning, speed, exposure_time, rate)
+        rank = (factor, speed if speed is not None else 0, -rate)
+        candidates.append((rank, candidate))
+
+    if best_rate is None:
+        raise ValueError(
+            f"no binning can cover {shape} with subarray steps {steps} on {max_shape}"
+        )
+    if not candidates:
+        raise ValueError(
+            f"unable to reach {target} Hz over {shape}, best is {best_rate:.2f} Hz"
+        )
+    return min(candidates, key=lambda candidate: candidate[0])[1]
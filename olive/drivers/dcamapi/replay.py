@@ -0,0 +1,155 @@
+import logging
+import time
+
+import numpy as np
+
+from olive.devices import BufferRetrieveMode
+from olive.devices.base import DeviceInfo
+
+from .generic import HamamatsuCamera
+from .session import SessionReader
+
+__all__ = ["ReplayCamera"]
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayCamera(HamamatsuCamera):
+    """
+    Replay a recorded session through the regular camera retrieval API.
+
+    Frames are served straight from the memory-mapped session file, the recorded
+    property state answers all the property queries.
+
+    Args:
+        path (str): path of the session file
+        realtime (bool, optional): honor the recorded frame timing, otherwise deliver
+            frames as fast as possible
+        loop (bool, optional): restart from the first frame when the recording ends
+        driver (Driver, optional): owner of this device
+    """
+
+    def __init__(self, path, realtime=True, loop=False, driver=None):
+        super().__init__(driver, -1)
+        self._path = path
+        self._realtime, self._loop = realtime, loop
+
+        self._session = None
+        self._cursor, self._t0 = 0, None
+
+    ##
+
+    @property
+    def is_busy(self):
+        return self._t0 is not None
+
+    @property
+    def is_opened(self):
+        return self._session is not None
+
+    @property
+    def session(self):
+        return self._session
+
+    ##
+
+    async def test_open(self):
+        pass
+
+    async def _open(self):
+        self._session = SessionReader(self._path)
+        self._properties = {
+            name: i for i, name in enumerate(self._session.properties.keys())
+        }
+        logger.info(f'replaying {len(self._session)} frame(s) from "{self._path}"')
+
+    async def _close(self):
+        self.stop_recording()
+        self.stop_streaming()
+
+        self._session.close()
+        self._session = None
+
+    ##
+
+    async def get_device_info(self) -> DeviceInfo:
+        return DeviceInfo(**self._session.info)
+
+    ##
+
+    async def enumerate_properties(self):
+        return tuple(self._properties.keys())
+
+    async def get_property(self, name):
+        return self._session.properties[name]
+
+    async def set_property(self, name, value):
+        raise TypeError(f'property "{name}" is not writable during replay')
+
+    async def get_region_capability(self):
+        # no device behind, regions are cropped on the host
+        return {"type": [], "units": {"horizontal": 1, "vertical": 1}}
+
+    ##
+
+    async def configure_acquisition(self, n_frames, continuous=False, out=None):
+        if out is not None or self._requested_out is not None:
+            raise ValueError("destination array is not supported during replay")
+
+        # skip the event handle, no device behind
+        await super(HamamatsuCamera, self).configure_acquisition(n_frames, continuous)
+
+    async def _configure_frame_buffer(self, n_frames):
+        # frames are served from the session file, nothing to attach
+        await super(HamamatsuCamera, self)._configure_frame_buffer(n_frames)
+
+    def start_acquisition(self):
+        self._cursor, self._t0 = 0, time.perf_counter()
+        logger.debug("replay STARTED")
+
+    def _retrieve_frame(self, mode: BufferRetrieveMode):
+        if self._is_off_waiter():
+            return self._waiter.submit(self._retrieve_frame, mode).result()
+
+        session, timestamps = self._session, self._session.timestamps
+
+        if self._cursor >= len(session):
+            if not self._loop:
+                raise IndexError("end of recording")
+            self._cursor, self._t0 = 0, time.perf_counter()
+
+        if self._realtime:
+            if mode == BufferRetrieveMode.Latest:
+                # fast forward to the newest frame that has been "acquired"
+                elapsed = time.perf_counter() - self._t0
+                newest = int(np.searchsorted(timestamps, elapsed, side="right")) - 1
+                self._cursor = max(self._cursor, min(newest, len(session) - 1))
+
+            delay = self._t0 + timestamps[self._cursor] - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+        index = self._cursor
+        self._cursor += 1
+
+        frame = session.frames[index]
+        self._frame_number = index
+        newest_index, frame_count = session.transfer_info
+        self._notify_frame(
+            frame,
+            int(newest_index[index]),
+            int(frame_count[index]),
+            time.perf_counter(),
+        )
+        return frame
+
+    def _is_overwritten(self, k):
+        # frames are served from the session file, never reused
+        return False
+
+    def stop_acquisition(self):
+        self._t0 = None
+        logger.debug("replay STOPPED")
+
+    def unconfigure_acquisition(self):
+        super(HamamatsuCamera, self).unconfigure_acquisition()
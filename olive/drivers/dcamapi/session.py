@@ -0,0 +1,334 @@
+"""
+Acquisition session file.
+
+A session file holds everything needed to replay an acquisition offline
+
+- a JSON header with the device info, the property state at the start of recording and
+  the clock of the timestamps
+- one fixed-size record per retrieved frame, containing the timestamp of the frame, the
+  DCAM transfer info at that moment and the raw frame
+
+Records are fixed-size, therefore the reader maps the file as a structured array and
+hands out frames without copying. Frames torn by the camera while they were written are
+truncated away, every record in the file is valid.
+"""
+
+import json
+import logging
+import os
+import queue
+import struct
+import threading
+
+import numpy as np
+
+__all__ = ["SessionReader", "SessionRecorder", "SessionWriter"]
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"DCAMSES1"
+
+#: header length field that follows the magic
+_header_size = struct.Struct("<I")
+
+#: timestamp (s), newest frame index, frame count
+_record_header = struct.Struct("<dii")
+
+#: header is padded so that records start on an aligned offset
+_alignment = 64
+
+#: timestamp sources, host perf_counter at the frame-ready event, or the DCAM frame clock
+clocks = ("host", "device")
+
+
+def _record_dtype(shape, dtype):
+    return np.dtype(
+        [
+            ("timestamp", "<f8"),
+            ("newest_index", "<i4"),
+            ("frame_count", "<i4"),
+            ("frame", np.dtype(dtype), tuple(shape)),
+        ]
+    )
+
+
+class SessionWriter:
+    """
+    Append retrieved frames to a session file.
+
+    The header is written along with the first frame, since frame shape and data type
+    are only certain once the camera delivers. A session without frames gets a header
+    without layout on close.
+
+    Args:
+        path (str): path of the session file
+        properties (dict): property state of the camera
+        info (dict, optional): device info
+        clock (str, optional): source of the timestamps, see clocks
+    """
+
+    def __init__(self, path, properties, info=None, clock="host"):
+        if clock not in clocks:
+            raise ValueError(f'unknown clock "{clock}", expecting one of {clocks}')
+        self._path = path
+        self._properties, self._info = properties, info if info else dict()
+        self._clock = clock
+        self._fd = open(path, "wb")
+        self._layout = None
+        self._n_frames, self._last_offset = 0, None
+
+    def __len__(self):
+        return self._n_frames
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def clock(self):
+        return self._clock
+
+    def write(self, frame, newest_index, frame_count, timestamp):
+        if self._layout is None:
+            self._write_header(frame.shape, frame.dtype)
+        elif self._layout != (frame.shape, frame.dtype):
+            raise ValueError("frame layout changed during recording")
+
+        offset = self._fd.tell()
+        try:
+            self._fd.write(_record_header.pack(timestamp, newest_index, frame_count))
+            self._fd.write(np.ascontiguousarray(frame).data)
+        except BaseException:
+            # never leave a partial record behind
+            self._truncate(offset)
+            raise
+        self._n_frames += 1
+        self._last_offset = offset
+
+    def discard_last(self):
+        """Remove the last record, e.g. its frame got torn while it was written."""
+        if self._last_offset is None:
+            raise RuntimeError("no record to discard")
+        self._truncate(self._last_offset)
+        self._n_frames -= 1
+        self._last_offset = None
+
+    def close(self):
+        if self._fd is None:
+            return
+        if self._layout is None:
+            self._write_header(None, None)
+        self._fd.close()
+        self._fd = None
+        logger.info(f"{self._n_frames} frame(s) recorded to {self._path}")
+
+    ##
+
+    def _write_header(self, shape, dtype):
+        self._layout = (shape, dtype)
+
+        header = {
+            "shape": list(shape) if shape is not None else None,
+            "dtype": np.dtype(dtype).str if dtype is not None else None,
+            "clock": self._clock,
+            "info": self._info,
+            "properties": self._properties,
+        }
+        header = json.dumps(header).encode("utf-8")
+
+        offset = len(MAGIC) + _header_size.size + len(header)
+        header += b" " * (-offset % _alignment)
+
+        self._fd.write(MAGIC)
+        self._fd.write(_header_size.pack(len(header)))
+        self._fd.write(header)
+
+    def _truncate(self, offset):
+        try:
+            self._fd.seek(offset)
+            self._fd.truncate()
+        except OSError as err:
+            logger.error(f"unable to truncate {self._path} to {offset} bytes, {err}")
+
+    ##
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SessionRecorder:
+    """
+    Write to a session file from a worker thread, retrieval never waits for the disk.
+
+    A writer error, e.g. a full disk or a frame layout change, stops the recording, the
+    frames that follow are counted as lost.
+
+    Args:
+        writer (SessionWriter): session file to write
+        is_overwritten (callable, optional): is_overwritten(k), whether the buffer of
+            frame k may have been reused, checked before and after writing
+        thread_initializer (callable, optional): called by the worker thread on start
+    """
+
+    def __init__(self, writer, is_overwritten=None, thread_initializer=None):
+        self._writer = writer
+        self._is_overwritten = is_overwritten
+        self._thread_initializer = thread_initializer
+
+        self._frames = queue.Queue()
+        self._n_written, self._n_lost = 0, 0
+        self._error = None
+
+        self._thread = threading.Thread(
+            target=self._run, name="dcamapi-record", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def path(self):
+        return self._writer.path
+
+    @property
+    def statistics(self):
+        return {"written": self._n_written, "lost": self._n_lost}
+
+    @property
+    def error(self):
+        """Exception that stopped the recording, None if it is still running."""
+        return self._error
+
+    def put(self, k, frame, newest_index, frame_count, timestamp):
+        """Queue frame k for writing, never blocks."""
+        self._frames.put((k, frame, newest_index, frame_count, timestamp))
+
+    def close(self):
+        """Write what is already queued, then close the session file."""
+        self._frames.put(None)
+        self._thread.join()
+        self._writer.close()
+        if self._n_lost:
+            logger.warning(f"{self._n_lost} frame(s) lost during recording")
+
+    ##
+
+    def _run(self):
+        if self._thread_initializer is not None:
+            self._thread_initializer()
+
+        is_overwritten = self._is_overwritten
+        while True:
+            item = self._frames.get()
+            if item is None:
+                return
+            k, *record = item
+
+            if self._error is not None:
+                self._n_lost += 1
+                continue
+            if is_overwritten is not None and is_overwritten(k):
+                logger.error(f"frame {k} overwritten before it was recorded")
+                self._n_lost += 1
+                continue
+            try:
+                self._writer.write(*record)
+                # torn if the buffer got reused while writing
+                if is_overwritten is not None and is_overwritten(k):
+                    logger.error(f"frame {k} overwritten while it was recorded")
+                    self._writer.discard_last()
+                    self._n_lost += 1
+                else:
+                    self._n_written += 1
+            except Exception as err:
+                logger.error(f"recording to {self.path} stopped at frame {k}, {err}")
+                self._error = err
+                self._n_lost += 1
+
+
+class SessionReader:
+    """
+    Memory-mapped view of a session file.
+
+    Args:
+        path (str): path of the session file
+    """
+
+    def __init__(self, path):
+        self._path = path
+
+        with open(path, "rb") as fd:
+            if fd.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'"{path}" is not a session file')
+            (nbytes,) = _header_size.unpack(fd.read(_header_size.size))
+            header = json.loads(fd.read(nbytes).decode("utf-8"))
+        offset = len(MAGIC) + _header_size.size + nbytes
+
+        self._info, self._properties = header["info"], header["properties"]
+        # sessions recorded before the clock was stored used the host clock
+        self._clock = header.get("clock", "host")
+
+        if header["shape"] is None:
+            # closed without frames, layout is unknown
+            self._shape, self._dtype = None, None
+            self._records = np.empty(0, dtype=_record_dtype((), np.uint8))
+        else:
+            self._shape = tuple(header["shape"])
+            self._dtype = np.dtype(header["dtype"])
+            dtype = _record_dtype(self._shape, self._dtype)
+            if os.path.getsize(path) > offset:
+                self._records = np.memmap(path, dtype=dtype, mode="r", offset=offset)
+            else:
+                # unable to map an empty region
+                self._records = np.empty(0, dtype=dtype)
+
+        timestamps = self._records["timestamp"]
+        self._timestamps = timestamps - timestamps[0] if len(timestamps) else timestamps
+
+    def __len__(self):
+        return len(self._records)
+
+    ##
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def info(self):
+        return self._info
+
+    @property
+    def properties(self):
+        return self._properties
+
+    @property
+    def shape(self):
+        return self._shape
+
+    @property
+    def dtype(self):
+        return self._dtype
+
+    @property
+    def clock(self):
+        """Source of the timestamps, see clocks."""
+        return self._clock
+
+    @property
+    def timestamps(self):
+        """Timestamps relative to the first frame, in seconds."""
+        return self._timestamps
+
+    @property
+    def transfer_info(self):
+        return self._records["newest_index"], self._records["frame_count"]
+
+    @property
+    def frames(self):
+        return self._records["frame"]
+
+    def close(self):
+        # memmap is released with its last reference
+        self._records, self._timestamps = None, None
@@ -0,0 +1,351 @@
+"""
+Frame streaming over local sockets.
+
+A client connects, sends its subscription, then receives one message per frame
+
+- header, index (u8), timestamp (f8), height (u4), width (u4), dtype (4 bytes, e.g.
+  b"<u2\\0")
+- raw frame data
+- status (u1), non-zero if the frame buffer got reused while it was sent
+
+Every client is served by its own sender thread. Latest-only clients always get the
+newest frame and skip whatever they were too slow for. Lossless clients queue up to a
+fixed depth and are disconnected once they fall behind, a slow client never stalls
+the publisher nor the other clients.
+
+Frames are sent straight from the buffers they were published with. Frames that are
+overwritten before they are sent are dropped, the ones overwritten while being sent
+are flagged and dropped by the client.
+"""
+
+import collections
+import logging
+import os
+import socket
+import struct
+import threading
+
+import numpy as np
+
+__all__ = ["FrameClient", "FrameServer", "Subscription"]
+
+logger = logging.getLogger(__name__)
+
+#: mode, decimation
+_subscription = struct.Struct("<BI")
+
+#: index, timestamp, height, width, dtype
+_frame_header = struct.Struct("<Qd2I4s")
+
+#: overwritten while sent
+_frame_status = struct.Struct("<B")
+
+
+class Subscription:
+    Latest = 0
+    Lossless = 1
+
+
+def _create_socket(address):
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    return socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+
+
+def _send_buffers(sock, buffers):
+    """Scatter/gather send, falls back to consecutive sends without sendmsg."""
+    buffers = [memoryview(buffer).cast("B") for buffer in buffers]
+    if not hasattr(sock, "sendmsg"):
+        for buffer in buffers:
+            sock.sendall(buffer)
+        return
+
+    while buffers:
+        nbytes = sock.sendmsg(buffers)
+        while nbytes:
+            if nbytes >= len(buffers[0]):
+                nbytes -= len(buffers.pop(0))
+            else:
+                buffers[0], nbytes = buffers[0][nbytes:], 0
+
+
+def _recv_into(sock, buffer):
+    view = memoryview(buffer).cast("B")
+    while len(view):
+        nbytes = sock.recv_into(view)
+        if nbytes == 0:
+            raise ConnectionError("connection closed")
+        view = view[nbytes:]
+
+
+class _Subscriber:
+    def __init__(self, server, sock, mode, decimation):
+        self._server, self._sock = server, sock
+        self._mode, self._decimation = mode, max(decimation, 1)
+
+        self._lock = threading.Condition()
+        depth = 1 if mode == Subscription.Latest else server.queue_depth
+        self._pending = collections.deque(maxlen=depth)
+        self._is_closed = False
+
+        self._n_offered, self._n_sent, self._n_skipped = 0, 0, 0
+        self._n_dropped = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name="dcamapi-stream", daemon=True
+        )
+
+    @property
+    def statistics(self):
+        return {
+            "mode": "lossless" if self._mode == Subscription.Lossless else "latest",
+            "decimation": self._decimation,
+            "sent": self._n_sent,
+            "skipped": self._n_skipped,
+            "dropped": self._n_dropped,
+        }
+
+    def start(self):
+        self._thread.start()
+
+    def offer(self, frame, index, timestamp):
+        """Never blocks, called from the acquisition thread."""
+        self._n_offered += 1
+        if (self._n_offered - 1) % self._decimation:
+            return
+
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                if self._mode == Subscription.Lossless:
+                    logger.warning("lossless client fell behind, disconnecting")
+                    self._is_closed = True
+                else:
+                    # replaced by the newer frame
+                    self._n_skipped += 1
+            self._pending.append((frame, index, timestamp))
+            self._lock.notify()
+
+    def close(self):
+        with self._lock:
+            self._is_closed = True
+            self._lock.notify()
+        try:
+            # unblock a pending send
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._thread.join()
+
+    def _run(self):
+        initializer = self._server.thread_initializer
+        if initializer is not None:
+            initializer()
+        is_overwritten = self._server.is_overwritten
+
+        try:
+            while True:
+                with self._lock:
+                    while not self._pending and not self._is_closed:
+                        self._lock.wait()
+                    if self._is_closed:
+                        break
+                    frame, index, timestamp = self._pending.popleft()
+
+                if is_overwritten is not None and is_overwritten(index):
+                    self._n_dropped += 1
+                    continue
+                if not frame.flags.c_contiguous:
+                    frame = np.ascontiguousarray(frame)
+                header = _frame_header.pack(
+                    index,
+                    timestamp,
+                    frame.shape[0],
+                    frame.shape[1],
+                    frame.dtype.str.encode("ascii"),
+                )
+                _send_buffers(self._sock, (header, frame))
+                torn = is_overwritten is not None and is_overwritten(index)
+                self._sock.sendall(_frame_status.pack(torn))
+                if torn:
+                    self._n_dropped += 1
+                else:
+                    self._n_sent += 1
+        except OSError as err:
+            logger.info(f"client disconnected, {err}")
+        finally:
+            self._sock.close()
+            self._server._remove(self)
+
+
+class FrameServer:
+    """
+    Publish frames to socket clients.
+
+    Args:
+        address (str or tuple): path of a Unix domain socket, or (host, port)
+        queue_depth (int, optional): frames a lossless client may lag behind, has to be
+            smaller than the frame ring when publishing ring slots
+        thread_initializer (callable, optional): called by each sender thread on start
+        is_overwritten (callable, optional): is_overwritten(index), whether the buffer
+            of a published frame may have been reused, checked before and after sending
+    """
+
+    def __init__(
+        self, address, queue_depth=4, thread_initializer=None, is_overwritten=None
+    ):
+        self._address = address
+        self.queue_depth = queue_depth
+        self.thread_initializer = thread_initializer
+        self.is_overwritten = is_overwritten
+
+        self._sock = None
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._thread = None
+
+    ##
+
+    @property
+    def address(self):
+        """Address actually bound, resolves port 0."""
+        return self._sock.getsockname() if self._sock is not None else self._address
+
+    @property
+    def clients(self):
+        with self._lock:
+            return [subscriber.statistics for subscriber in self._subscribers]
+
+    ##
+
+    def start(self):
+        self._sock = _create_socket(self._address)
+        if self._sock.family == socket.AF_INET:
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self._address)
+        self._sock.listen()
+        self._sock.settimeout(0.5)
+
+        self._thread = threading.Thread(
+            target=self._accept, name="dcamapi-stream-accept", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"streaming on {self.address}")
+
+    def stop(self):
+        if self._sock is None:
+            return
+        sock, self._sock = self._sock, None
+        self._thread.join()
+        sock.close()
+        if sock.family == socket.AF_UNIX:
+            os.unlink(self._address)
+
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.close()
+
+    def publish(self, frame, index, timestamp):
+        """Offer a frame to all the clients, never blocks."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            subscriber.offer(frame, index, timestamp)
+
+    ##
+
+    def _accept(self):
+        sock = self._sock
+        while self._sock is not None:
+            try:
+                client, _ = sock.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            try:
+                client.settimeout(5)
+                request = bytearray(_subscription.size)
+                _recv_into(client, request)
+                client.settimeout(None)
+            except (OSError, ConnectionError) as err:
+                logger.warning(f"invalid subscription, {err}")
+                client.close()
+                continue
+            if client.family == socket.AF_INET:
+                client.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            mode, decimation = _subscription.unpack(request)
+            subscriber = _Subscriber(self, client, mode, decimation)
+            with self._lock:
+                self._subscribers.append(subscriber)
+            subscriber.start()
+
+    def _remove(self, subscriber):
+        with self._lock:
+            try:
+                self._subscribers.remove(subscriber)
+            except ValueError:
+                pass
+
+
+class FrameClient:
+    """
+    Receive frames from a FrameServer.
+
+    Args:
+        address (str or tuple): address of the server
+        mode (int, optional): Subscription.Latest or Subscription.Lossless
+        decimation (int, optional): receive every n-th frame only
+    """
+
+    def __init__(self, address, mode=Subscription.Latest, decimation=1):
+        self._sock = _create_socket(address)
+        self._sock.connect(address)
+        self._sock.sendall(_subscription.pack(mode, decimation))
+
+        self._header = bytearray(_frame_header.size)
+        self._status = bytearray(_frame_status.size)
+        self._n_dropped = 0
+
+    @property
+    def dropped(self):
+        """Frames received torn and dropped."""
+        return self._n_dropped
+
+    def receive(self, out=None):
+        """
+        Receive the next intact frame.
+
+        Args:
+            out (np.ndarray, optional): reused if shape and dtype match
+
+        Returns:
+            (tuple) frame, index, timestamp
+        """
+        while True:
+            _recv_into(self._sock, self._header)
+            index, timestamp, ny, nx, dtype = _frame_header.unpack(self._header)
+            dtype = np.dtype(dtype.rstrip(b"\0").decode("ascii"))
+
+            if out is None or out.shape != (ny, nx) or out.dtype != dtype:
+                out = np.empty((ny, nx), dtype)
+            _recv_into(self._sock, out)
+
+            _recv_into(self._sock, self._status)
+            (torn,) = _frame_status.unpack(self._status)
+            if not torn:
+                return out, index, timestamp
+            self._n_dropped += 1
+
+    def close(self):
+        self._sock.close()
+
+    ##
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
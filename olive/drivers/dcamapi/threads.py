@@ -0,0 +1,266 @@
+"""
+Thread placement, CPU affinity and scheduling priority.
+
+Affinity and scheduling are per-thread on Linux, placement is therefore applied by the
+thread itself. Other platforms keep the defaults and report so.
+
+Memory is bound to NUMA nodes through libnuma, which is only loaded when needed.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import mmap
+import os
+import sys
+import threading
+from collections import Counter
+
+import numpy as np
+
+__all__ = [
+    "ThreadPlacement",
+    "bind_memory",
+    "current_placement",
+    "memory_nodes",
+    "numa_node_cpus",
+]
+
+logger = logging.getLogger(__name__)
+
+_is_linux = sys.platform.startswith("linux")
+
+# see numaif.h
+_MPOL_BIND = 2
+_MPOL_MF_MOVE = 1 << 1
+
+_libnuma = None
+
+
+def _load_libnuma():
+    global _libnuma
+    if _libnuma is not None:
+        return _libnuma
+
+    path = ctypes.util.find_library("numa") if _is_linux else None
+    if path is None:
+        raise OSError("libnuma is not available")
+    libnuma = ctypes.CDLL(path, use_errno=True)
+
+    libnuma.mbind.argtypes = [
+        ctypes.c_void_p,
+        ctypes.c_ulong,
+        ctypes.c_int,
+        ctypes.POINTER(ctypes.c_ulong),
+        ctypes.c_ulong,
+        ctypes.c_uint,
+    ]
+    libnuma.mbind.restype = ctypes.c_long
+    libnuma.move_pages.argtypes = [
+        ctypes.c_int,
+        ctypes.c_ulong,
+        ctypes.POINTER(ctypes.c_void_p),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.POINTER(ctypes.c_int),
+        ctypes.c_int,
+    ]
+    libnuma.move_pages.restype = ctypes.c_long
+
+    _libnuma = libnuma
+    return _libnuma
+
+
+def _check_errno(result):
+    if result:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+
+
+def _page_span(buffer, whole):
+    """
+    Page-aligned [start, end) of a buffer.
+
+    Args:
+        buffer (object): exposes the buffer protocol
+        whole (bool): only the pages the buffer fills entirely, otherwise every page it
+            touches
+    """
+    array = np.asarray(buffer)
+    start, end = array.ctypes.data, array.ctypes.data + array.nbytes
+    # first and last page touched, both inclusive
+    first, last = start // mmap.PAGESIZE, (end - 1) // mmap.PAGESIZE
+    if whole:
+        # drop the partially filled pages at either end
+        first += start % mmap.PAGESIZE != 0
+        last -= end % mmap.PAGESIZE != 0
+    return first * mmap.PAGESIZE, max(first, last + 1) * mmap.PAGESIZE
+
+
+def bind_memory(buffers, node):
+    """
+    Bind buffers to a NUMA node, pages that are already faulted in are migrated.
+
+    Buffers need not be page-aligned, only the pages a buffer fills entirely are bound.
+    Pages shared with neighbouring allocations keep their policy.
+
+    Args:
+        buffers (list): objects that expose the buffer protocol
+        node (int): NUMA node
+    """
+    libnuma = _load_libnuma()
+
+    bits = 8 * ctypes.sizeof(ctypes.c_ulong)
+    nodemask = (ctypes.c_ulong * (node // bits + 1))()
+    nodemask[node // bits] = 1 << (node % bits)
+    maxnode = len(nodemask) * bits + 1
+
+    for buffer in buffers:
+        start, end = _page_span(buffer, whole=True)
+        if start == end:
+            continue
+        _check_errno(
+            libnuma.mbind(
+                start, end - start, _MPOL_BIND, nodemask, maxnode, _MPOL_MF_MOVE
+            )
+        )
+
+
+def memory_nodes(buffers):
+    """
+    NUMA nodes the pages of buffers actually reside on, every page touched by the
+    buffers is counted once.
+
+    Returns:
+        (dict) node -> number of pages, negative keys are errno of pages without a
+        node, e.g. -ENOENT for pages not faulted in yet
+    """
+    libnuma = _load_libnuma()
+
+    pages = set()
+    for buffer in buffers:
+        pages.update(range(*_page_span(buffer, whole=False), mmap.PAGESIZE))
+    pages = sorted(pages)
+    status = (ctypes.c_int * len(pages))()
+    _check_errno(
+        libnuma.move_pages(
+            0, len(pages), (ctypes.c_void_p * len(pages))(*pages), None, status, 0
+        )
+    )
+    return dict(Counter(status))
+
+
+def numa_node_cpus(node):
+    """CPUs that belong to a NUMA node."""
+    path = f"/sys/devices/system/node/node{node}/cpulist"
+    try:
+        with open(path, "r") as fd:
+            cpulist = fd.read().strip()
+    except OSError:
+        raise ValueError(f"NUMA node {node} does not exist")
+
+    cpus = set()
+    for span in cpulist.split(","):
+        if "-" in span:
+            first, last = span.split("-")
+            cpus.update(range(int(first), int(last) + 1))
+        elif span:
+            cpus.add(int(span))
+    return cpus
+
+
+def current_placement():
+    """Placement the calling thread actually runs with."""
+    placement = {
+        "thread": threading.current_thread().name,
+        "native_id": threading.get_native_id(),
+    }
+    if not _is_linux:
+        return placement
+
+    policy = os.sched_getscheduler(0)
+    placement.update(
+        {
+            "cpus": sorted(os.sched_getaffinity(0)),
+            "policy": {
+                os.SCHED_OTHER: "other",
+                os.SCHED_FIFO: "fifo",
+                os.SCHED_RR: "rr",
+            }.get(policy, str(policy)),
+            "priority": os.sched_getparam(0).sched_priority,
+            "nice": os.getpriority(os.PRIO_PROCESS, threading.get_native_id()),
+        }
+    )
+    return placement
+
+
+class ThreadPlacement:
+    """
+    Where and how a thread should run.
+
+    Args:
+        cpus (iterable of int, optional): CPUs the thread may run on
+        numa_node (int, optional): restrict to the CPUs of a NUMA node, intersects with
+            cpus if both are provided
+        priority (int, optional): SCHED_FIFO real-time priority, 1-99
+        nice (int, optional): nice value, ignored if priority is set
+    """
+
+    def __init__(self, cpus=None, numa_node=None, priority=None, nice=None):
+        self._cpus = set(cpus) if cpus is not None else None
+        self._numa_node = numa_node
+        self._priority, self._nice = priority, nice
+
+    def __repr__(self):
+        options = {
+            "cpus": sorted(self._cpus) if self._cpus is not None else None,
+            "numa_node": self._numa_node,
+            "priority": self._priority,
+            "nice": self._nice,
+        }
+        options = ", ".join(f"{k}={v}" for k, v in options.items() if v is not None)
+        return f"<ThreadPlacement {options}>"
+
+    ##
+
+    @property
+    def numa_node(self):
+        return self._numa_node
+
+    @property
+    def cpus(self):
+        cpus = self._cpus
+        if self._numa_node is not None:
+            node_cpus = numa_node_cpus(self._numa_node)
+            cpus = node_cpus if cpus is None else cpus & node_cpus
+        return cpus
+
+    def apply(self):
+        """
+        Apply to the calling thread, failures are logged and left at the default.
+
+        Returns:
+            (dict) placement actually achieved, see current_placement
+        """
+        if not _is_linux:
+            logger.warning(f"thread placement is not supported on {sys.platform}")
+            return current_placement()
+
+        cpus = self.cpus
+        if cpus:
+            try:
+                os.sched_setaffinity(0, cpus)
+            except OSError as err:
+                logger.warning(f"unable to set affinity {sorted(cpus)}, {err}")
+
+        if self._priority is not None:
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self._priority))
+            except OSError as err:
+                logger.warning(f"unable to set real-time priority, {err}")
+        elif self._nice is not None:
+            try:
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self._nice)
+            except OSError as err:
+                logger.warning(f"unable to set nice value {self._nice}, {err}")
+
+        return current_placement()
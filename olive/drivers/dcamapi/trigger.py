@@ -0,0 +1,191 @@
+"""
+Pre/post-trigger recording.
+
+DCAM-API keeps writing the attached ring during a continuous acquisition, frame number
+k always lands in slot k % capacity. The recorder therefore only has to remember how
+many frames were captured, on a trigger the pre-trigger window is still sitting in the
+ring and the post-trigger frames will arrive there. A worker thread streams them to
+the writer straight from the ring slots.
+
+Pre-trigger frames were retrieved before anyone asked for them, their only timestamp is
+the DCAM frame clock, sessions are therefore recorded with the device clock.
+"""
+
+import logging
+import queue
+import threading
+
+import numpy as np
+
+from .generic import _guard_slots
+
+__all__ = ["TriggeredRecorder"]
+
+logger = logging.getLogger(__name__)
+
+
+class TriggeredRecorder:
+    """
+    Keep the most recent frames of a continuous acquisition, write them out on events.
+
+    Args:
+        camera (HamamatsuCamera): camera in continuous acquisition, e.g. grab()
+        writer (SessionWriter): session file opened with the "device" clock, written
+            from a worker thread with views of the ring slots
+        n_pre (int): frames to keep before the trigger
+        n_post (int): frames to record after the trigger
+        condition (callable, optional): condition(frame), evaluated on each retrieved
+            frame, trigger when it returns True
+    """
+
+    def __init__(self, camera, writer, n_pre, n_post, condition=None):
+        if writer.clock != "device":
+            raise ValueError(
+                "triggered recording stores the DCAM frame clock, open the writer with "
+                'clock="device"'
+            )
+        self._camera, self._writer = camera, writer
+        self._n_pre, self._n_post = n_pre, n_post
+        self._condition = condition
+
+        self._lock = threading.Condition()
+        self._n_captured, self._layout = 0, None
+        self._end = None  # end of the active window, exclusive
+
+        self._windows = queue.Queue()
+        self._thread, self._stopping = None, threading.Event()
+        self._n_written, self._n_lost = 0, 0
+        self._error = None
+
+    ##
+
+    @property
+    def is_running(self):
+        return self._thread is not None
+
+    @property
+    def is_triggered(self):
+        with self._lock:
+            return self._end is not None and self._end > self._n_captured
+
+    @property
+    def statistics(self):
+        return {"written": self._n_written, "lost": self._n_lost}
+
+    @property
+    def error(self):
+        """Exception that stopped the recording, None if it is still running."""
+        return self._error
+
+    ##
+
+    def start(self):
+        camera = self._camera
+        if camera._destination is not None:
+            raise RuntimeError("triggered recording requires the internal ring")
+        capacity = camera.buffer.capacity()
+        if self._n_pre > capacity - _guard_slots - 1:
+            raise ValueError(
+                f"ring holds {capacity} frame(s), unable to keep {self._n_pre} "
+                "pre-trigger frame(s)"
+            )
+
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="dcamapi-trigger", daemon=True
+        )
+        self._thread.start()
+        camera.add_frame_listener(self._on_frame)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._camera.remove_frame_listener(self._on_frame)
+
+        # write what is already captured, abandon the rest
+        self._stopping.set()
+        self._windows.put(None)
+        with self._lock:
+            self._lock.notify_all()
+        self._thread.join()
+        self._thread = None
+
+        logger.info(
+            f"triggered recording stopped, {self._n_written} frame(s) written, "
+            f"{self._n_lost} lost"
+        )
+
+    def trigger(self):
+        """
+        Write the pre-trigger window and the upcoming post-trigger frames.
+
+        Returns:
+            (bool) False if a window is still being recorded
+        """
+        with self._lock:
+            n = self._n_captured
+            if self._end is not None and self._end > n:
+                logger.debug("trigger ignored, recording in progress")
+                return False
+            start, self._end = max(n - self._n_pre, 0), n + self._n_post
+        logger.info(f"triggered at frame {n}, recording [{start}, {self._end})")
+        self._windows.put((start, self._end))
+        return True
+
+    ##
+
+    def _on_frame(self, frame, newest_index, frame_count, timestamp):
+        with self._lock:
+            self._n_captured = frame_count
+            if self._layout is None:
+                self._layout = (frame.shape, frame.dtype)
+            self._lock.notify_all()
+
+        if self._condition is not None and self._condition(frame):
+            self.trigger()
+
+    def _run(self):
+        self._camera.place_thread("writer")
+        while True:
+            window = self._windows.get()
+            if window is None:
+                return
+            start, end = window
+            for k in range(start, end):
+                if self._error is not None:
+                    # nothing is written after an error, the rest of the window is lost
+                    self._n_lost += end - k
+                    break
+                with self._lock:
+                    while k >= self._n_captured and not self._stopping.is_set():
+                        self._lock.wait()
+                    if k >= self._n_captured:
+                        logger.warning(f"stopped before frame {k} was captured")
+                        break
+                try:
+                    written = self._write(k)
+                except Exception as err:
+                    logger.error(f"triggered recording stopped at frame {k}, {err}")
+                    self._error, written = err, False
+                if not written:
+                    self._n_lost += 1
+
+    def _write(self, k):
+        # retrieval may lag behind, DCAM-API keeps lapping the ring regardless
+        if self._camera._is_overwritten(k):
+            logger.error(f"frame {k} overwritten before it was written")
+            return False
+
+        slot = k % self._camera.buffer.capacity()
+        shape, dtype = self._layout
+        frame = np.asarray(self._camera.buffer.frames[slot]).view(dtype).reshape(shape)
+        timestamp = self._camera.api.frame_timestamp(slot)
+        self._writer.write(frame, slot, k + 1, timestamp)
+
+        # torn if the slot got reused while writing
+        if self._camera._is_overwritten(k):
+            logger.error(f"frame {k} overwritten while it was written")
+            self._writer.discard_last()
+            return False
+        self._n_written += 1
+        return True
@@ -18,6 +18,9 @@ cimport numpy as np
 from dcamapi cimport *
 from dcamprop cimport *
 
+cdef extern from '<thread>' nogil:
+    void thread_yield 'std::this_thread::yield'()
+
 ##
 ## Driver
 ##
@@ -321,6 +324,39 @@ cdef class DCAM:
         """
         pass
 
+    def set_region(self, rects=None, mask=None):
+        """
+        Set readout regions, either as rectangles or as a byte mask. Clear the regions
+        if neither is provided.
+
+        Args:
+            rects (array_like, optional): (left, top, right, bottom) of each region
+            mask (np.ndarray, optional): 2-D byte mask, non-zero for pixels to read out
+        """
+        cdef DCAMDATA_REGION param
+        memset(&param, 0, sizeof(param))
+        param.hdr.size = sizeof(param)
+        param.hdr.iKind = DCAMDATA_KIND.DCAMDATA_KIND__REGION
+
+        cdef np.int16_t[:, ::1] c_rects
+        cdef np.uint8_t[:, ::1] c_mask
+        if rects is not None and len(rects) > 0:
+            c_rects = np.ascontiguousarray(rects, dtype=np.int16).reshape(-1, 4)
+            param.type = DCAMDATA_REGIONTYPE.DCAMDATA_REGIONTYPE__RECT16ARRAY
+            param.data = &c_rects[0, 0]
+            param.datasize = c_rects.shape[0] * sizeof(DCAMDATA_REGIONRECT)
+        elif mask is not None:
+            c_mask = np.ascontiguousarray(mask, dtype=np.uint8)
+            param.type = DCAMDATA_REGIONTYPE.DCAMDATA_REGIONTYPE__BYTEMASK
+            param.data = &c_mask[0, 0]
+            param.datasize = c_mask.shape[0] * c_mask.shape[1]
+        else:
+            param.type = DCAMDATA_REGIONTYPE.DCAMDATA_REGIONTYPE__NONE
+
+        cdef DCAMERR err
+        err = dcamdev_setdata(self.handle, &param.hdr)
+        DCAMAPI.check_error(err, 'dcamdev_setdata()', self.handle)
+
     def get_data(self):
         """
         Get the data that is impossible to get from property. WTF!?
@@ -351,6 +387,16 @@ cdef class DCAM:
             'readable': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_READABLE),
         }
 
+        # behavior
+        attributes.update({
+            'auto_rounding': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_AUTOROUNDING),
+            'stepping_inconsistent': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_STEPPING_INCONSISTENT),
+            'volatile': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_VOLATILE),
+            'data_stream': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_DATASTREAM),
+            'access_ready': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_ACCESSREADY),
+            'access_busy': pybool(attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_ATTR_ACCESSBUSY),
+        })
+
         # type
         prop_type = attr.attribute & DCAMPROPATTRIBUTE.DCAMPROP_TYPE_MASK
         if prop_type == DCAMPROPATTRIBUTE.DCAMPROP_TYPE_MODE:
@@ -538,6 +584,24 @@ cdef class DCAM:
         else:
             raise NotImplementedError(f'unsupported pixel format')
 
+    cpdef frame_timestamp(self, int32 iframe=-1):
+        """
+        Returns the timestamp of a captured frame in seconds.
+
+        Args:
+            iframe (int): frame index, -1 to retrieve the latest frame
+        """
+        cdef DCAMBUF_FRAME bufframe
+        memset(&bufframe, 0, sizeof(bufframe))
+        bufframe.size = sizeof(bufframe)
+        bufframe.iFrame = iframe
+
+        cdef DCAMERR err
+        err = dcambuf_lockframe(self.handle, &bufframe)
+        DCAMAPI.check_error(err, 'dcambuf_lockframe()', self.handle)
+
+        return bufframe.timestamp.sec + bufframe.timestamp.microsec * 1e-6
+
     def copy_frame(self):
         pass
 
@@ -589,6 +653,46 @@ cdef class DCAM:
 
         return info.nNewestFrameIndex, info.nFrameCount
 
+    def poll_transfer(self, int32 last_count, int32 n_spin=1000, int32 n_yield=1000):
+        """
+        Busy-poll the transfer info until the frame count moves past last_count.
+
+        The GIL is released while polling. Returns after a bounded number of polls so
+        the caller can check its own timeout and stop conditions.
+
+        Args:
+            last_count (int): frame count seen last
+            n_spin (int): polls that keep spinning on the CPU
+            n_yield (int): following polls that yield the CPU in between
+
+        Returns:
+            (tuple) newest frame index and frame count, None if nothing arrived
+        """
+        if n_spin + n_yield < 1:
+            raise ValueError('at least one poll is required')
+
+        cdef DCAMCAP_TRANSFERINFO info
+        memset(&info, 0, sizeof(info))
+        info.size = sizeof(info)
+
+        cdef DCAMERR err
+        cdef int32 i
+        cdef bint arrived = False
+        with nogil:
+            for i in range(n_spin + n_yield):
+                err = dcamcap_transferinfo(self.handle, &info)
+                if failed(err) or info.nFrameCount != last_count:
+                    arrived = True
+                    break
+                if i >= n_spin:
+                    thread_yield()
+        DCAMAPI.check_error(err, 'dcamcap_transferinfo()', self.handle)
+
+        if arrived:
+            return info.nNewestFrameIndex, info.nFrameCount
+        else:
+            return None
+
     def fire_trigger(self):
         cdef DCAMERR err
         err = dcamcap_firetrigger(self.handle)
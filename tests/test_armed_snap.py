@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from pprint import pprint
+
+import coloredlogs
+
+from olive.drivers.dcamapi import DCAMAPI
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def snaps(camera, n_snaps):
+    overheads = []
+    for _ in range(n_snaps):
+        await camera.snap()
+        overheads.append(sum(camera.acquisition_timings.values()) * 1000)
+    return overheads
+
+
+async def main(n_snaps=20, t_exp=10, shape=(1024, 1024)):
+    driver = DCAMAPI()
+
+    try:
+        await driver.initialize()
+
+        devices = await driver.enumerate_devices()
+        pprint(devices)
+
+        camera = devices[0]
+        await camera.open()
+
+        try:
+            await camera.set_exposure_time(t_exp)
+            await camera.set_roi(shape=shape)
+
+            overheads = await snaps(camera, n_snaps)
+            logger.info(f"unarmed, mean overhead {sum(overheads) / n_snaps:.2f} ms")
+
+            camera.arm()
+            try:
+                overheads = await snaps(camera, n_snaps)
+                logger.info(f"armed, mean overhead {sum(overheads) / n_snaps:.2f} ms")
+            finally:
+                camera.disarm()
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
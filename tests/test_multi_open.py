@@ -0,0 +1,39 @@
+import asyncio
+import logging
+from pprint import pprint
+
+import coloredlogs
+
+from olive.drivers.dcamapi import DCAMAPI
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    driver = DCAMAPI()
+
+    try:
+        await driver.initialize()
+
+        # candidates are tested concurrently
+        cameras = await driver.enumerate_devices()
+        pprint(cameras)
+
+        try:
+            await driver.open_devices(cameras)
+            for camera in cameras:
+                logger.info(f"{camera}, {camera.startup_timings}")
+        finally:
+            await asyncio.gather(*[camera.close() for camera in cameras])
+
+        logger.info(f"driver, {driver.startup_timings}")
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
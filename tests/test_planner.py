@@ -0,0 +1,104 @@
+import asyncio
+from pprint import pprint
+
+import pytest
+
+from olive.drivers.dcamapi.planner import binning_factor, frame_rate, plan
+
+MAX_SHAPE, STEPS = (2048, 2048), (4, 4)
+
+# readout time per sensor row, in s
+TIMING = {
+    ("1x1", 1): 10e-6,
+    ("1x1", 2): 5e-6,
+    ("2x2", 1): 5e-6,
+    ("2x2", 2): 2.5e-6,
+}
+
+
+def test_binning_factor():
+    assert binning_factor(None) == 1
+    assert binning_factor("1x1") == 1
+    assert binning_factor("4X4") == 4
+
+
+def test_frame_rate():
+    # readout bound
+    assert frame_rate(1000, 1, 10e-6) == pytest.approx(100)
+    # exposure bound
+    assert frame_rate(10, 20, 10e-6) == pytest.approx(50)
+
+
+def test_prefers_slow_readout_without_binning():
+    frame_plan = plan(150, (512, 512), 1, MAX_SHAPE, STEPS, TIMING)
+    assert (frame_plan.binning, frame_plan.readout_speed) == ("1x1", 1)
+    assert frame_plan.pos0 == (768, 768) and frame_plan.shape == (512, 512)
+    assert frame_plan.frame_rate >= 150
+
+
+def test_trades_readout_speed_before_binning():
+    frame_plan = plan(300, (512, 512), 1, MAX_SHAPE, STEPS, TIMING)
+    assert (frame_plan.binning, frame_plan.readout_speed) == ("1x1", 2)
+
+    frame_plan = plan(700, (512, 512), 1, MAX_SHAPE, STEPS, TIMING)
+    assert (frame_plan.binning, frame_plan.readout_speed) == ("2x2", 2)
+
+
+def test_aligns_field_of_view():
+    frame_plan = plan(100, (510, 301), 1, MAX_SHAPE, STEPS, TIMING)
+    assert frame_plan.shape == (512, 304)
+    assert all(p % s == 0 for p, s in zip(frame_plan.pos0, STEPS))
+
+
+def test_unreachable_frame_rate():
+    with pytest.raises(ValueError, match="best is 781.25 Hz"):
+        plan(1000, (512, 512), 0.5, MAX_SHAPE, STEPS, TIMING)
+
+
+def test_exposure_exceeds_frame_period():
+    with pytest.raises(ValueError, match="exceeds the frame period"):
+        plan(100, (512, 512), 20, MAX_SHAPE, STEPS, TIMING)
+
+
+def test_field_of_view_cannot_be_covered():
+    # 2046 is not a multiple of the step, the largest subarray is 2044
+    with pytest.raises(ValueError, match="no binning can cover"):
+        plan(1, (2046, 2046), 1, (2046, 2046), STEPS, TIMING)
+
+
+async def main(target=400, t_exp=2, shape=(512, 1024)):
+    # requires the camera
+    from olive.drivers.dcamapi import DCAMAPI
+
+    driver = DCAMAPI()
+
+    try:
+        await driver.initialize()
+
+        devices = await driver.enumerate_devices()
+        pprint(devices)
+
+        camera = devices[0]
+        await camera.open()
+
+        try:
+            pprint(await camera.get_readout_timing())
+
+            frame_plan = await camera.plan_frame_rate(
+                target, shape=shape, exposure_time=t_exp, apply=True
+            )
+            pprint(frame_plan._asdict())
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    import coloredlogs
+
+    coloredlogs.install(
+        level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+    )
+
+    asyncio.run(main())
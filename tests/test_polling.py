@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from pprint import pprint
+
+import coloredlogs
+
+from olive.drivers.dcamapi import DCAMAPI, ThreadPlacement
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main(t_exp=5, shape=(256, 256), t_total=5):
+    driver = DCAMAPI()
+
+    try:
+        await driver.initialize()
+
+        devices = await driver.enumerate_devices()
+        pprint(devices)
+
+        camera = devices[0]
+        await camera.open()
+
+        try:
+            camera.configure_threads(waiter=ThreadPlacement(cpus=[2]))
+
+            await camera.set_exposure_time(t_exp)
+            await camera.set_roi(shape=shape)
+
+            def feedback(frame, newest_index, frame_count, timestamp):
+                # closed-loop control goes here
+                frame.mean()
+
+            await camera.configure_acquisition(16, continuous=True)
+            camera.start_acquisition()
+            try:
+                await camera.start_polling(feedback)
+                await asyncio.sleep(t_total)
+                camera.stop_polling()
+            finally:
+                camera.stop_acquisition()
+                camera.unconfigure_acquisition()
+
+            pprint(camera.polling_latency)
+            pprint(camera.thread_placement())
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
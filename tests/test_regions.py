@@ -0,0 +1,85 @@
+import asyncio
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from olive.drivers.dcamapi import ReplayCamera
+from olive.drivers.dcamapi.session import SessionWriter
+
+SHAPE = (64, 48)
+
+
+def run_with_camera(coro):
+    # replay has no device behind, regions always fall back to the host
+    path = os.path.join(tempfile.mkdtemp(), "regions.ses")
+    properties = {"image_height": SHAPE[0], "image_width": SHAPE[1]}
+    with SessionWriter(path, properties) as writer:
+        writer.write(np.zeros(SHAPE, dtype=np.uint16), 0, 1, 0.0)
+
+    async def main():
+        camera = ReplayCamera(path, realtime=False)
+        await camera.open()
+        try:
+            await coro(camera)
+        finally:
+            await camera.close()
+
+    asyncio.run(main())
+
+
+def make_frame():
+    return np.arange(np.prod(SHAPE), dtype=np.uint16).reshape(SHAPE)
+
+
+def test_split_regions():
+    async def check(camera):
+        frame = make_frame()
+        assert camera.split_regions(frame) is frame
+
+        await camera.set_regions([((0, 0), (8, 8)), ((10, 20), (4, 6))])
+        views = camera.split_regions(frame)
+        assert [view.shape for view in views] == [(8, 8), (4, 6)]
+        assert (views[1] == frame[10:14, 20:26]).all()
+        assert all(np.shares_memory(view, frame) for view in views)
+
+        await camera.clear_regions()
+        assert camera.split_regions(frame) is frame
+
+    run_with_camera(check)
+
+
+@pytest.mark.parametrize(
+    "region",
+    [
+        ((-1, 0), (8, 8)),
+        ((60, 0), (8, 8)),
+        ((0, 0), (0, 8)),
+        ((10, 10), (8, -4)),
+    ],
+)
+def test_invalid_regions(region):
+    async def check(camera):
+        with pytest.raises(ValueError):
+            await camera.set_regions([region])
+        assert camera.split_regions(make_frame()).shape == SHAPE
+
+    run_with_camera(check)
+
+
+def test_region_mask():
+    async def check(camera):
+        with pytest.raises(ValueError, match="mask has to be"):
+            await camera.set_region_mask(np.ones((8, 8), dtype=bool))
+
+        mask = np.zeros(SHAPE, dtype=bool)
+        mask[4:12, 8:16] = True
+        await camera.set_region_mask(mask)
+
+        frame = make_frame()
+        masked = camera.split_regions(frame)
+        assert masked.count() == mask.sum()
+        assert (masked.compressed() == frame[mask]).all()
+
+    run_with_camera(check)
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+import time
+from pprint import pprint
+
+import coloredlogs
+
+from olive.drivers.dcamapi import DCAMAPI, ReplayCamera
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def record(path, n_frames, t_exp=20, shape=(2048, 2048)):
+    driver = DCAMAPI()
+    try:
+        await driver.initialize()
+
+        cameras = await driver.enumerate_devices()
+        pprint(cameras)
+        assert len(cameras) > 0, "no camera"
+
+        camera = cameras[0]
+        try:
+            await camera.open()
+
+            await camera.set_exposure_time(t_exp)
+            await camera.set_roi(shape=shape)
+
+            await camera.start_recording(path)
+            async for _ in camera.sequence(n_frames):
+                pass
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+async def replay(path, n_frames, realtime):
+    camera = ReplayCamera(path, realtime=realtime)
+    try:
+        await camera.open()
+        logger.info(f"exposure {await camera.get_exposure_time()} ms")
+
+        t0 = time.perf_counter()
+        async for frame in camera.sequence(n_frames):
+            pass
+        t = time.perf_counter() - t0
+        logger.info(f"realtime={realtime}, {n_frames} frame(s) in {t:.3f} s")
+    finally:
+        await camera.close()
+
+
+async def main(path="_debug.ses", n_frames=100):
+    await record(path, n_frames)
+    await replay(path, n_frames, realtime=True)
+    await replay(path, n_frames, realtime=False)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
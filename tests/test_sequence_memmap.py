@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from pprint import pprint
+
+import coloredlogs
+import numpy as np
+
+from olive.drivers.dcamapi import DCAMAPI
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main(dst_path="_debug.raw", t_exp=20, n_frames=500, shape=(2048, 2048)):
+    driver = DCAMAPI()
+    try:
+        await driver.initialize()
+
+        cameras = await driver.enumerate_devices()
+        pprint(cameras)
+        assert len(cameras) > 0, "no camera"
+
+        camera = cameras[0]
+        try:
+            await camera.open()
+
+            await camera.set_exposure_time(t_exp)
+            await camera.set_roi(shape=shape)
+
+            # frames land in the page cache directly
+            dtype = await camera.get_dtype()
+            stack = np.memmap(
+                dst_path, dtype=dtype, mode="w+", shape=(n_frames,) + shape
+            )
+
+            i = 0
+            async for frame in camera.sequence(n_frames, out=stack):
+                assert np.shares_memory(frame, stack)
+                i += 1
+            logger.info(f"{i} frame(s) written to {dst_path}")
+
+            stack.flush()
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+import os
+import tempfile
+
+import numpy as np
+import pytest
+
+from olive.drivers.dcamapi.session import SessionReader, SessionRecorder, SessionWriter
+
+
+def session_path():
+    return os.path.join(tempfile.mkdtemp(), "test.ses")
+
+
+def make_frame(i, shape=(32, 24)):
+    return np.full(shape, i, dtype=np.uint16)
+
+
+def test_round_trip(n_frames=10):
+    path = session_path()
+    properties = {"exposure_time": 0.01}
+    with SessionWriter(path, properties, {"model": "C0000"}) as writer:
+        for i in range(n_frames):
+            writer.write(make_frame(i), i % 4, i + 1, 1.5 + i * 1e-2)
+        assert len(writer) == n_frames
+
+    session = SessionReader(path)
+    assert len(session) == n_frames
+    assert session.properties == properties and session.info == {"model": "C0000"}
+    assert session.shape == (32, 24) and session.dtype == np.uint16
+    assert np.allclose(session.timestamps, np.arange(n_frames) * 1e-2)
+    newest_index, frame_count = session.transfer_info
+    assert list(newest_index) == [i % 4 for i in range(n_frames)]
+    assert list(frame_count) == list(range(1, n_frames + 1))
+    for i, frame in enumerate(session.frames):
+        assert (frame == i).all()
+    session.close()
+
+
+def test_empty_session():
+    path = session_path()
+    SessionWriter(path, {}).close()
+
+    session = SessionReader(path)
+    assert len(session) == 0 and session.shape is None
+    assert len(session.timestamps) == 0
+
+
+def test_clock():
+    path = session_path()
+    with SessionWriter(path, {}, clock="device") as writer:
+        writer.write(make_frame(0), 0, 1, 0.0)
+    assert SessionReader(path).clock == "device"
+
+    with pytest.raises(ValueError, match="unknown clock"):
+        SessionWriter(session_path(), {}, clock="wall")
+
+
+def test_layout_change_is_rejected():
+    path = session_path()
+    with SessionWriter(path, {}) as writer:
+        writer.write(make_frame(0), 0, 1, 0.0)
+        with pytest.raises(ValueError, match="frame layout changed"):
+            writer.write(make_frame(1, shape=(16, 24)), 1, 2, 1.0)
+        writer.write(make_frame(2), 2, 3, 2.0)
+
+    session = SessionReader(path)
+    assert [int(frame[0, 0]) for frame in session.frames] == [0, 2]
+
+
+def test_layout_change_stops_recording():
+    path = session_path()
+    recorder = SessionRecorder(SessionWriter(path, {}))
+    for i in range(3):
+        recorder.put(i, make_frame(i), i, i + 1, float(i))
+    recorder.put(3, make_frame(3, shape=(16, 24)), 3, 4, 3.0)
+    for i in range(4, 6):
+        recorder.put(i, make_frame(i), i, i + 1, float(i))
+    recorder.close()
+
+    assert recorder.statistics == {"written": 3, "lost": 3}
+    assert isinstance(recorder.error, ValueError)
+    assert len(SessionReader(path)) == 3
+
+
+def test_overwritten_frames_are_lost(n_frames=10):
+    checks = {}
+
+    def is_overwritten(k):
+        checks[k] = checks.get(k, 0) + 1
+        # 3 is reused before it is written, 6 while it is written
+        return k == 3 or (k == 6 and checks[k] == 2)
+
+    path = session_path()
+    recorder = SessionRecorder(SessionWriter(path, {}), is_overwritten=is_overwritten)
+    for i in range(n_frames):
+        recorder.put(i, make_frame(i), i, i + 1, float(i))
+    recorder.close()
+
+    assert recorder.statistics == {"written": n_frames - 2, "lost": 2}
+    assert recorder.error is None
+
+    # torn frames never reach the file
+    session = SessionReader(path)
+    indices = [int(frame[0, 0]) for frame in session.frames]
+    assert indices == [i for i in range(n_frames) if i not in (3, 6)]
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_empty_session()
+    test_clock()
+    test_layout_change_is_rejected()
+    test_layout_change_stops_recording()
+    test_overwritten_frames_are_lost()
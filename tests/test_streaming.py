@@ -0,0 +1,134 @@
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from olive.drivers.dcamapi.streaming import FrameClient, FrameServer, Subscription
+
+
+def publish(server, n_frames, shape=(64, 48), interval=1e-3):
+    frames = []
+    for i in range(n_frames):
+        frame = np.full(shape, i, dtype=np.uint16)
+        frames.append(frame)
+        server.publish(frame, i, float(i))
+        time.sleep(interval)
+    return frames
+
+
+def wait_for_clients(server, n_clients, timeout=5):
+    t0 = time.monotonic()
+    while len(server.clients) < n_clients:
+        assert time.monotonic() - t0 < timeout, "clients did not subscribe"
+        time.sleep(1e-3)
+
+
+def test_lossless_tcp(n_frames=50):
+    server = FrameServer(("127.0.0.1", 0), queue_depth=n_frames)
+    server.start()
+    try:
+        with FrameClient(server.address, Subscription.Lossless) as client:
+            wait_for_clients(server, 1)
+            publish(server, n_frames)
+
+            for i in range(n_frames):
+                frame, index, timestamp = client.receive()
+                assert index == i and timestamp == float(i)
+                assert frame.dtype == np.uint16 and frame.shape == (64, 48)
+                assert (frame == i).all()
+    finally:
+        server.stop()
+
+
+def test_decimation_unix(n_frames=30, decimation=3):
+    path = os.path.join(tempfile.mkdtemp(), "stream.sock")
+    server = FrameServer(path, queue_depth=n_frames)
+    server.start()
+    try:
+        with FrameClient(path, Subscription.Lossless, decimation) as client:
+            wait_for_clients(server, 1)
+            publish(server, n_frames)
+
+            indices = [client.receive()[1] for _ in range(n_frames // decimation)]
+            assert indices == list(range(0, n_frames, decimation))
+    finally:
+        server.stop()
+    assert not os.path.exists(path)
+
+
+def test_slow_client_does_not_block(n_frames=200):
+    server = FrameServer(("127.0.0.1", 0), queue_depth=4)
+    server.start()
+    try:
+        fast = FrameClient(server.address, Subscription.Lossless)
+        slow = FrameClient(server.address, Subscription.Latest)
+        wait_for_clients(server, 2)
+
+        received = []
+
+        def drain():
+            for _ in range(n_frames):
+                received.append(fast.receive()[1])
+
+        thread = threading.Thread(target=drain)
+        thread.start()
+
+        # slow client never reads, publishing must not stall
+        t0 = time.monotonic()
+        publish(server, n_frames, shape=(512, 512), interval=1e-3)
+        assert time.monotonic() - t0 < 5
+
+        stats = {s["mode"]: s for s in server.clients}
+        assert stats["latest"]["skipped"] > 0
+
+        thread.join(timeout=5)
+        assert received == list(range(n_frames))
+
+        fast.close()
+        slow.close()
+    finally:
+        server.stop()
+
+
+def test_overwritten_frames_are_dropped(n_frames=10):
+    checks = {}
+
+    def is_overwritten(index):
+        checks[index] = checks.get(index, 0) + 1
+        # 3 is reused before it is sent, 6 while it is sent
+        return index == 3 or (index == 6 and checks[index] == 2)
+
+    server = FrameServer(
+        ("127.0.0.1", 0), queue_depth=n_frames, is_overwritten=is_overwritten
+    )
+    server.start()
+    try:
+        with FrameClient(server.address, Subscription.Lossless) as client:
+            wait_for_clients(server, 1)
+            publish(server, n_frames)
+
+            indices = []
+            for _ in range(n_frames - 2):
+                frame, index, _ = client.receive()
+                assert (frame == index).all()
+                indices.append(index)
+            assert indices == [i for i in range(n_frames) if i not in (3, 6)]
+            assert client.dropped == 1
+
+            # counters are updated after the status is sent
+            t0 = time.monotonic()
+            while server.clients[0]["sent"] < n_frames - 2:
+                assert time.monotonic() - t0 < 5, "frames not accounted for"
+                time.sleep(1e-3)
+            assert server.clients[0]["dropped"] == 2
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    test_lossless_tcp()
+    test_decimation_unix()
+    test_slow_client_does_not_block()
+    test_overwritten_frames_are_dropped()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+from pprint import pprint
+
+import coloredlogs
+
+from olive.drivers.dcamapi import DCAMAPI, TriggeredRecorder
+from olive.drivers.dcamapi.session import SessionWriter
+
+coloredlogs.install(
+    level="DEBUG", fmt="%(asctime)s %(levelname)s %(message)s", datefmt="%H:%M:%S"
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def main(path="_debug.ses", t_exp=10, n_pre=100, n_post=50, threshold=1000):
+    driver = DCAMAPI()
+    try:
+        await driver.initialize()
+
+        cameras = await driver.enumerate_devices()
+        pprint(cameras)
+        assert len(cameras) > 0, "no camera"
+
+        camera = cameras[0]
+        try:
+            await camera.open()
+            await camera.set_exposure_time(t_exp)
+
+            with SessionWriter(path, {}, clock="device") as writer:
+                recorder = TriggeredRecorder(
+                    camera,
+                    writer,
+                    n_pre,
+                    n_post,
+                    condition=lambda frame: frame.mean() > threshold,
+                )
+
+                await camera.configure_grab()
+                recorder.start()
+                try:
+                    i = 0
+                    async for _ in camera.grab():
+                        i += 1
+                        if i == 500:
+                            # software event
+                            recorder.trigger()
+                        elif i > 1000:
+                            break
+                finally:
+                    recorder.stop()
+                logger.info(f"{recorder.statistics}")
+        finally:
+            await camera.close()
+    finally:
+        await driver.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())